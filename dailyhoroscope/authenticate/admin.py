@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import CustomUser, UserProfile
+from .models import AccountDeletion, CustomUser, OutgoingEmail, RevokedToken, UserProfile
 
 # Register your models here.
 @admin.register(CustomUser)
@@ -13,3 +13,21 @@ class UserProfileAdmin(admin.ModelAdmin):
     list_display = [
         "user"
     ]
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = [
+        "id", "to", "subject", "date_created", "date_sent", "attempts"
+    ]
+
+@admin.register(AccountDeletion)
+class AccountDeletionAdmin(admin.ModelAdmin):
+    list_display = [
+        "user", "date_requested"
+    ]
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = [
+        "jti", "expires", "date_revoked"
+    ]
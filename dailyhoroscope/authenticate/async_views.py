@@ -0,0 +1,64 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import JsonResponse
+from . import views
+
+# password hashing runs in this pool, so under asgi.py it never blocks the event loop.
+# Requests beyond AUTH_HASHING_WORKERS running plus AUTH_HASHING_QUEUE waiting get a 503
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+def get_hashing_pool():
+    global _executor, _slots
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.AUTH_HASHING_WORKERS,
+                thread_name_prefix='auth-hashing',
+            )
+            _slots = threading.BoundedSemaphore(settings.AUTH_HASHING_WORKERS + settings.AUTH_HASHING_QUEUE)
+    return _executor, _slots
+
+def shutdown_hashing_pool():
+    global _executor, _slots
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _executor = _slots = None
+
+def run_view(view, request, args, kwargs):
+    # pool threads keep their own database connections, closed here like at the end of a request
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+def offload(view_class):
+    view = view_class.as_view()
+
+    async def async_view(request, *args, **kwargs):
+        executor, slots = get_hashing_pool()
+        if not slots.acquire(blocking=False):
+            response = JsonResponse({'message': 'Server is busy. Please try again shortly.'}, status=503)
+            response['Retry-After'] = '1'
+            return response
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, run_view, view, request, args, kwargs)
+        finally:
+            slots.release()
+    # set directly: before Django 5.0 the csrf_exempt decorator wraps a coroutine in a sync view
+    async_view.csrf_exempt = True
+    return async_view
+
+login_view = offload(views.LoginView)
+register_view = offload(views.RegisterView)
+change_password_view = offload(views.ChangePasswordView)
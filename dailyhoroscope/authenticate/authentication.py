@@ -1,9 +1,122 @@
 import datetime
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework.exceptions import AuthenticationFailed
+from .models import CustomUser, RevokedToken
 
 PASSWORD_CHANGED_ERROR_MESSAGE = 'Password has been changed. Please login again.'
+TOKEN_REVOKED_ERROR_MESSAGE = 'Token has been revoked. Please login again.'
+USER_STATE_CACHE_PREFIX = 'authenticate:user_state'
+
+# str(user id) -> (expiry, (is_active, last_password_change)), per process, least recently
+# used first and capped at AUTH_USER_STATE_MAX_ENTRIES; tokens may carry the id as a string,
+# so keys are always strings
+_user_states = OrderedDict()
+_user_states_lock = threading.Lock()
+
+def get_shared_cache():
+    alias = settings.AUTH_USER_STATE_CACHE
+    return caches[alias] if alias else None
+
+def load_user_state(user_id):
+    return CustomUser.objects.filter(id=user_id).values_list('is_active', 'last_password_change').first()
+
+def get_user_state(user_id):
+    # (is_active, last_password_change) of the user, or None if they do not exist
+    user_id = str(user_id)
+    shared = get_shared_cache()
+    if shared is not None:
+        key = f'{USER_STATE_CACHE_PREFIX}:{user_id}'
+        state = shared.get(key)
+        if state is None:
+            state = load_user_state(user_id)
+            if state is not None:
+                shared.set(key, state, settings.AUTH_USER_STATE_TTL)
+        return state
+
+    with _user_states_lock:
+        cached = _user_states.get(user_id)
+        if cached is not None and cached[0] > time.monotonic():
+            _user_states.move_to_end(user_id)
+            return cached[1]
+    state = load_user_state(user_id)
+    with _user_states_lock:
+        if state is None:
+            _user_states.pop(user_id, None)
+        else:
+            _user_states[user_id] = (time.monotonic() + settings.AUTH_USER_STATE_TTL, state)
+            _user_states.move_to_end(user_id)
+            while len(_user_states) > settings.AUTH_USER_STATE_MAX_ENTRIES:
+                _user_states.popitem(last=False)
+    return state
+
+def invalidate_user_state(user_id):
+    user_id = str(user_id)
+    with _user_states_lock:
+        _user_states.pop(user_id, None)
+    shared = get_shared_cache()
+    if shared is not None:
+        shared.delete(f'{USER_STATE_CACHE_PREFIX}:{user_id}')
+
+# revoked jti -> expiry, per process. Synced from the database every
+# AUTH_REVOKED_TOKEN_SYNC_INTERVAL seconds, so checking a token is a set lookup
+_revoked_tokens = {}
+_revoked_sync = {'next': 0, 'since': None}
+
+def sync_revoked_tokens(force=False):
+    now = timezone.now()
+    if not force and time.monotonic() < _revoked_sync['next']:
+        return
+    # rows from the last sync on, with an interval of overlap for clock differences between servers
+    revoked = RevokedToken.objects.filter(expires__gt=now)
+    if _revoked_sync['since'] is not None:
+        revoked = revoked.filter(date_revoked__gte=_revoked_sync['since'])
+    _revoked_tokens.update(revoked.values_list('jti', 'expires'))
+    for jti, expires in list(_revoked_tokens.items()):
+        if expires <= now:
+            del _revoked_tokens[jti]
+    interval = settings.AUTH_REVOKED_TOKEN_SYNC_INTERVAL
+    _revoked_sync['since'] = now - datetime.timedelta(seconds=interval)
+    _revoked_sync['next'] = time.monotonic() + interval
+
+def clear_revoked_tokens():
+    _revoked_tokens.clear()
+    _revoked_sync.update(next=0, since=None)
+
+def is_token_revoked(token):
+    sync_revoked_tokens()
+    return token.get(api_settings.JTI_CLAIM) in _revoked_tokens
+
+def revoke_tokens(*tokens):
+    # other processes pick the revocation up on their next sync
+    now = timezone.now()
+    revoked = [
+        RevokedToken(
+            jti=token[api_settings.JTI_CLAIM],
+            expires=datetime.datetime.fromtimestamp(token['exp'], tz=datetime.timezone.utc),
+        )
+        for token in tokens if token is not None
+    ]
+    RevokedToken.objects.bulk_create(revoked, ignore_conflicts=True)
+    RevokedToken.objects.filter(expires__lte=now).delete()
+    _revoked_tokens.update((token.jti, token.expires) for token in revoked)
+
+class LazyUser(SimpleLazyObject):
+    # the token has already been checked against the user's state, so permission checks
+    # can be answered without loading the user; anything else loads it on first use
+    is_authenticated = True
+    is_anonymous = False
+
+    def __bool__(self):
+        return True
 
 class CustomAuthentication(JWTAuthentication):
     def authenticate(self, request):
@@ -15,13 +128,25 @@ class CustomAuthentication(JWTAuthentication):
             return None
         
         validated_token = self.get_validated_token(raw_token)
-        user = self.get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+        if is_token_revoked(validated_token):
+            raise AuthenticationFailed(TOKEN_REVOKED_ERROR_MESSAGE, code='token_revoked')
+
+        state = get_user_state(user_id)
+        if state is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+        is_active, last_password_change = state
+        if not is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
 
         # add a second to take into account milliseconds being stored in the database value
         # i do not know how else to deal with this
         issue_date = datetime.datetime.fromtimestamp(validated_token['iat'], tz=datetime.timezone.utc) + timezone.timedelta(seconds=1)
-        if issue_date < user.last_password_change:
+        if issue_date < last_password_change:
             # functionality: error if issue date is before last password change
             raise AuthenticationFailed(PASSWORD_CHANGED_ERROR_MESSAGE)
 
-        return user, validated_token
+        return LazyUser(lambda: self.get_user(validated_token)), validated_token
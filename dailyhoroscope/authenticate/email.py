@@ -1,8 +1,11 @@
+import smtplib
 from datetime import timedelta
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
 from django.utils import timezone
 from rest_framework_simplejwt.tokens import Token
+from .models import OutgoingEmail
 
 class ResetToken(Token):
     token_type = "reset"
@@ -15,15 +18,112 @@ def generate_reset_token(user):
 
     return token
 
+def queue_email(subject, body, to):
+    # persisted and sent later by the send_queued_emails command, never inside a request
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=settings.EMAIL_HOST_USER,
+        to=to,
+    )
+
 def send_reset_email(user):
     token = generate_reset_token(user)
-    print(token)
 
-    res = send_mail(
+    queue_email(
         'Password Reset',
         f'We have received a request to reset your account\'s password. The token to include with your password change request is \n\n{token}\n\nThe given token will expire 1 day after it is issued, If you did not send this request, please ignore this email.',
-        settings.EMAIL_HOST_USER,
-        [user.email]
+        user.email
+    )
+
+    return True
+
+def claim_queued_emails(batch_size, max_attempts):
+    # lease due mail to this worker so concurrent workers skip it while it is being sent
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True).filter(
+                date_sent__isnull=True,
+                attempts__lt=max_attempts,
+                next_attempt__lte=now,
+            ).order_by('next_attempt')[:batch_size]
+        )
+        OutgoingEmail.objects.filter(id__in=[email.id for email in emails]).update(
+            next_attempt=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+        )
+    return emails
+
+def is_connection_error(error):
+    # the server answering with an error code leaves the connection usable, anything else at
+    # the socket level (including SMTPServerDisconnected) means it has to be reopened
+    return isinstance(error, OSError) and not isinstance(
+        error, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)
     )
 
-    return res == 1
+def reset_connection(connection):
+    # if reopening fails too, the backend opens a fresh connection for each later message
+    try:
+        connection.close()
+    except Exception:
+        pass
+    try:
+        connection.open()
+    except Exception:
+        pass
+
+def record_failure(email, error, max_attempts):
+    # exponential backoff: retry delay doubles with every failed attempt
+    email.attempts += 1
+    email.last_error = str(error)
+    email.next_attempt = timezone.now() + timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+    )
+    update_fields = ['attempts', 'last_error', 'next_attempt']
+    if email.attempts >= max_attempts:
+        # given up on, so the reset token in it is not kept around either
+        email.body = ''
+        update_fields.append('body')
+    email.save(update_fields=update_fields)
+
+def send_queued_emails(connection=None, batch_size=100, max_attempts=None):
+    # returns (sent, failed) for one batch, reusing a single open connection for all of it
+    max_attempts = max_attempts or settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    emails = claim_queued_emails(batch_size, max_attempts)
+    if not emails:
+        return 0, 0
+
+    connection = connection or get_connection()
+    sent = failed = 0
+    try:
+        # only close what this batch opened, so a worker can keep one connection across batches
+        opened = connection.open()
+    except Exception as error:
+        # the server is unreachable: every claimed email is charged an attempt and backs off,
+        # instead of staying leased with no error recorded
+        for email in emails:
+            record_failure(email, error, max_attempts)
+        return 0, len(emails)
+    try:
+        for email in emails:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email, [email.to], connection=connection
+            )
+            try:
+                message.send()
+            except Exception as error:
+                record_failure(email, error, max_attempts)
+                failed += 1
+                if is_connection_error(error):
+                    reset_connection(connection)
+            else:
+                # the body may hold a password reset token, so it is not kept once sent
+                email.attempts += 1
+                email.date_sent = timezone.now()
+                email.body = ''
+                email.save(update_fields=['attempts', 'date_sent', 'body'])
+                sent += 1
+    finally:
+        if opened:
+            connection.close()
+    return sent, failed
@@ -0,0 +1,103 @@
+import asyncio
+import datetime
+import time
+import uuid
+from urllib.parse import urlencode
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from authenticate.models import CustomUser
+
+class Command(BaseCommand):
+    help = (
+        'Compares logins/sec of the sync login view and the async one under concurrent requests, '
+        'both served by the project\'s ASGI application with the configured password hasher. '
+        'A throwaway user is created for the run and deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Logins sent to each view.')
+        parser.add_argument('--concurrency', type=int, default=20,
+                            help='Logins in flight at once.')
+        parser.add_argument('--host', default='localhost',
+                            help='Host header of the requests, must be in ALLOWED_HOSTS.')
+
+    def handle(self, *args, **options):
+        password = uuid.uuid4().hex
+        user = CustomUser.objects.create_user(
+            email=f'benchmark-{uuid.uuid4().hex}@benchmark.invalid',
+            username=f'benchmark-{uuid.uuid4().hex}',
+            password=password,
+            date_of_birth=datetime.date(2000, 1, 1),
+            accept_tos=True,
+        )
+        # the real application, unlike the test clients, keeps the request signals that close
+        # each request's database connection connected
+        application = get_asgi_application()
+        try:
+            for name in ('login_view', 'async_login_view'):
+                rate, codes = asyncio.run(self.run(application, reverse(name), user.email, password, options))
+                summary = ', '.join(f'{count} x {code}' for code, count in sorted(codes.items()))
+                self.stdout.write(f'{name}: {rate:.1f} logins/sec ({summary})')
+        finally:
+            user.delete()
+
+    async def run(self, application, url, email, password, options):
+        body = urlencode({'username': email, 'password': password}).encode('ascii')
+        gate = asyncio.Semaphore(options['concurrency'])
+        codes = {}
+
+        async def login():
+            async with gate:
+                status = await self.post(application, url, body, options['host'])
+            codes[status] = codes.get(status, 0) + 1
+
+        start = time.monotonic()
+        await asyncio.gather(*(login() for _ in range(options['requests'])))
+        elapsed = time.monotonic() - start
+        return options['requests'] / elapsed, codes
+
+    async def post(self, application, url, body, host):
+        # one ASGI HTTP request, returning the response status
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'POST',
+            'scheme': 'http',
+            'path': url,
+            'raw_path': url.encode('ascii'),
+            'query_string': b'',
+            'root_path': '',
+            'headers': [
+                (b'host', host.encode('ascii')),
+                (b'content-type', b'application/x-www-form-urlencoded'),
+                (b'content-length', str(len(body)).encode('ascii')),
+            ],
+            'client': ('127.0.0.1', 0),
+            'server': (host, 80),
+        }
+        sent = False
+        done = asyncio.Event()
+        status = None
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            # the client stays connected until the whole response has been sent
+            await done.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body' and not message.get('more_body', False):
+                done.set()
+
+        await application(scope, receive, send)
+        done.set()
+        return status
@@ -0,0 +1,38 @@
+import time
+from django.core.management.base import BaseCommand
+from authenticate.models import AccountDeletion
+from horoscope.retention import purge_user_horoscopes
+
+class Command(BaseCommand):
+    help = (
+        'Deletes the accounts whose deletion was requested, removing their horoscopes in batches first. '
+        'Horoscopes used by a daily horoscope are kept and moved to the deleted-content placeholder.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Horoscopes deleted per transaction.')
+        parser.add_argument('--sleep', type=float, default=0.1,
+                            help='Seconds to pause between batches.')
+        parser.add_argument('--loop', action='store_true', help='Keep waiting for new requests until interrupted.')
+        parser.add_argument('--interval', type=float, default=60, help='Seconds to wait when nothing is pending.')
+
+    def handle(self, *args, **options):
+        while True:
+            pending = list(AccountDeletion.objects.select_related('user').order_by('date_requested'))
+            for deletion in pending:
+                self.delete_account(deletion.user, options)
+            if not options['loop']:
+                break
+            if not pending:
+                time.sleep(options['interval'])
+
+    def delete_account(self, user, options):
+        start = time.monotonic()
+        deleted, reassigned = purge_user_horoscopes(user, batch_size=options['batch_size'], sleep=options['sleep'])
+        # only the profile and the request itself are left to cascade
+        user.delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {user.username}: {deleted} horoscope(s) deleted, {reassigned} kept for daily horoscopes '
+            f'in {time.monotonic() - start:.2f}s.'
+        ))
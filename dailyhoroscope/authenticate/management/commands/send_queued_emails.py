@@ -0,0 +1,49 @@
+import time
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from authenticate.email import send_queued_emails
+
+class Command(BaseCommand):
+    help = 'Sends queued emails (e.g. password resets) from the outbox, retrying failures with backoff.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--max-attempts', type=int, default=None)
+        parser.add_argument('--loop', action='store_true', help='Keep draining the outbox until interrupted.')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds to wait when the outbox is empty.')
+
+    def handle(self, *args, **options):
+        # one connection per batch instead of one per email; it is opened only when there is
+        # mail to send and closed after it, so it never sits idle (and dropped) while polling
+        connection = get_connection()
+        try:
+            self.drain(connection, options)
+        finally:
+            connection.close()
+
+    def drain(self, connection, options):
+        total_sent = total_failed = 0
+        while True:
+            try:
+                sent, failed = send_queued_emails(
+                    connection=connection,
+                    batch_size=options['batch_size'],
+                    max_attempts=options['max_attempts'],
+                )
+            except Exception as error:
+                # e.g. the database going away: a looping worker waits and tries again
+                if not options['loop']:
+                    raise
+                self.stderr.write(f'Sending queued emails failed: {error}')
+                time.sleep(options['interval'])
+                continue
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f'Sent {sent} email(s), {failed} failed.')
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Done: {total_sent} sent, {total_failed} failed.'))
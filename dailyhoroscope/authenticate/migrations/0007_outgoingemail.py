@@ -0,0 +1,30 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authenticate', '0006_alter_userprofile_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255)),
+                ('body', models.TextField(default='')),
+                ('from_email', models.CharField(max_length=255)),
+                ('to', models.EmailField(max_length=255)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('date_sent', models.DateTimeField(null=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(default='')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('date_sent__isnull', True)), fields=['next_attempt'], name='outgoing_email_pending_idx')],
+            },
+        ),
+    ]
@@ -86,3 +86,43 @@ class UserProfile(models.Model):
         if self.dob_public:
             ans['date_of_birth'] = self.user.date_of_birth.strftime(DATEOFBIRTH_FORMAT)
         return ans
+
+
+class OutgoingEmail(models.Model):
+    subject = models.CharField(max_length=255)
+    body = models.TextField(default="")
+    from_email = models.CharField(max_length=255)
+    to = models.EmailField(max_length=255)
+    date_created = models.DateTimeField(auto_now_add=True)
+    date_sent = models.DateTimeField(null=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(default="")
+
+    class Meta:
+        indexes = [
+            # only unsent mail is ever polled for
+            models.Index(
+                fields=['next_attempt'],
+                condition=models.Q(date_sent__isnull=True),
+                name='outgoing_email_pending_idx',
+            ),
+        ]
+
+
+class AccountDeletion(models.Model):
+    # accounts whose deletion was requested, the user is deactivated right away and
+    # removed with their content later by the delete_pending_accounts command
+    user = models.OneToOneField(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="+"
+    )
+    date_requested = models.DateTimeField(auto_now_add=True)
+
+
+class RevokedToken(models.Model):
+    # jti of a token that must no longer be accepted, kept until the token would have expired anyway
+    jti = models.CharField(max_length=255, unique=True)
+    expires = models.DateTimeField(db_index=True)
+    date_revoked = models.DateTimeField(auto_now_add=True, db_index=True)
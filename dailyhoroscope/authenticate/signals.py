@@ -1,5 +1,6 @@
-from django.db.models.signals import post_save, pre_delete
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
+from .authentication import invalidate_user_state
 from .models import CustomUser, UserProfile
 
 @receiver(post_save, sender=CustomUser)
@@ -9,3 +10,9 @@ def post_save_create_profile(sender, instance, created, **kwargs):
             user=instance,
             description=""
         )
+
+# password changes and deactivations must not be hidden by the cached state
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def post_change_invalidate_user_state(sender, instance, **kwargs):
+    invalidate_user_state(instance.pk)
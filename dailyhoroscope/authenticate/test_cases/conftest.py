@@ -1,7 +1,14 @@
+from authenticate.authentication import clear_revoked_tokens
 from authenticate.models import CustomUser, UserProfile
 import datetime
 import pytest
 
+@pytest.fixture(autouse=True)
+def revoked_tokens():
+    clear_revoked_tokens()
+    yield
+    clear_revoked_tokens()
+
 @pytest.mark.django_db
 @pytest.fixture
 def user1(db, django_user_model):
@@ -0,0 +1,91 @@
+import asyncio
+import io
+import json
+import pytest
+from django.core.management import call_command
+from django.test import AsyncClient
+from django.urls import reverse
+from authenticate import async_views
+from authenticate.models import CustomUser
+
+# the views run in pool threads, which only see committed data
+pytestmark = pytest.mark.django_db(transaction=True)
+
+@pytest.fixture(autouse=True)
+def hashing_pool():
+    async_views.shutdown_hashing_pool()
+    yield
+    async_views.shutdown_hashing_pool()
+
+def test_async_login(user1):
+    async def login():
+        return await AsyncClient().post(
+            reverse('async_login_view'),
+            data={'username': 'kazumakiryu@rgg.com', 'password': 'Password123!'}
+        )
+    response = asyncio.run(login())
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert results['message'] == 'Login successful.'
+    assert 'access' in results['data']
+
+def test_async_login_wrong_password(user1):
+    async def login():
+        return await AsyncClient().post(
+            reverse('async_login_view'),
+            data={'username': 'kazumakiryu@rgg.com', 'password': 'WrongPassword!'}
+        )
+    response = asyncio.run(login())
+    assert response.status_code == 404
+
+def test_async_login_sheds_load(user1, settings):
+    settings.AUTH_HASHING_WORKERS = 1
+    settings.AUTH_HASHING_QUEUE = 0
+
+    async def login():
+        return await AsyncClient().post(
+            reverse('async_login_view'),
+            data={'username': 'kazumakiryu@rgg.com', 'password': 'Password123!'}
+        )
+
+    # another login holds the only slot
+    _, slots = async_views.get_hashing_pool()
+    slots.acquire()
+    response = asyncio.run(login())
+    results = json.loads(response.content.decode('utf-8'))
+    assert response.status_code == 503
+    assert response['Retry-After'] == '1'
+    assert results['message'] == 'Server is busy. Please try again shortly.'
+
+    slots.release()
+    response = asyncio.run(login())
+    assert response.status_code == 200
+
+def test_benchmark_login(db):
+    out = io.StringIO()
+    call_command('benchmark_login', '--requests=4', '--concurrency=2', stdout=out)
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith('login_view: ') and '4 x 200' in lines[0]
+    assert lines[1].startswith('async_login_view: ') and '4 x 200' in lines[1]
+    # the throwaway user does not outlive the run
+    assert not CustomUser.objects.filter(email__endswith='@benchmark.invalid').exists()
+
+def test_async_change_password(client, user1):
+    response = client.post(
+        reverse('login_view'),
+        data={'username': 'kazumakiryu@rgg.com', 'password': 'Password123!'}
+    )
+    token = json.loads(response.content.decode('utf-8'))['data']['access']
+
+    async def change_password():
+        return await AsyncClient().put(
+            reverse('async_change_password_view'),
+            data={'old_password': 'Password123!', 'new_password': 'Password456!'},
+            content_type='application/json',
+            headers={'AUTHORIZATION': f'Bearer {token}'}
+        )
+    response = asyncio.run(change_password())
+    assert response.status_code == 202
+    user1.refresh_from_db()
+    assert user1.check_password('Password456!')
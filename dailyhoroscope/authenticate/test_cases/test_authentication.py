@@ -0,0 +1,92 @@
+import datetime
+import json
+import pytest
+from unittest import mock
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from authenticate.authentication import (
+    CustomAuthentication, PASSWORD_CHANGED_ERROR_MESSAGE, TOKEN_REVOKED_ERROR_MESSAGE, _user_states, get_user_state,
+    invalidate_user_state, revoke_tokens, sync_revoked_tokens,
+)
+from authenticate.models import RevokedToken
+
+def login(client, email):
+    response = client.post(
+        reverse('login_view'),
+        data={'username': email, 'password': 'Password123!'}
+    )
+    return json.loads(response.content.decode('utf-8'))['data']['access']
+
+def test_authenticate_cached(client, user1, django_assert_num_queries):
+    token = login(client, user1.email)
+    request = RequestFactory().get('/', headers={'AUTHORIZATION': f'Bearer {token}'})
+    CustomAuthentication().authenticate(request)
+
+    # the user's state is cached, and the user itself is not loaded until it is used
+    with django_assert_num_queries(0):
+        user, _ = CustomAuthentication().authenticate(request)
+        assert user.is_authenticated
+    assert user.username == user1.username
+
+def test_user_state_cache_bounded(settings):
+    settings.AUTH_USER_STATE_MAX_ENTRIES = 2
+    state = (True, timezone.now())
+    with mock.patch('authenticate.authentication.load_user_state', return_value=state):
+        for user_id in range(1, 4):
+            get_user_state(user_id)
+    # the least recently used user was evicted
+    assert list(_user_states) == ['2', '3']
+    for user_id in (2, 3):
+        invalidate_user_state(user_id)
+
+def test_authenticate_after_password_change(client, user1):
+    token = login(client, user1.email)
+    request = RequestFactory().get('/', headers={'AUTHORIZATION': f'Bearer {token}'})
+    CustomAuthentication().authenticate(request)
+
+    user1.set_password('Password456!')
+    user1.last_password_change = timezone.now() + datetime.timedelta(seconds=10)
+    user1.save()
+
+    with pytest.raises(AuthenticationFailed) as error:
+        CustomAuthentication().authenticate(request)
+    assert error.value.detail == PASSWORD_CHANGED_ERROR_MESSAGE
+
+def test_authenticate_inactive(client, user1):
+    token = login(client, user1.email)
+    request = RequestFactory().get('/', headers={'AUTHORIZATION': f'Bearer {token}'})
+    CustomAuthentication().authenticate(request)
+
+    user1.is_active = False
+    user1.save()
+
+    with pytest.raises(AuthenticationFailed):
+        CustomAuthentication().authenticate(request)
+
+def test_authenticate_revoked(client, user1, django_assert_num_queries):
+    token = login(client, user1.email)
+    request = RequestFactory().get('/', headers={'AUTHORIZATION': f'Bearer {token}'})
+    _, validated_token = CustomAuthentication().authenticate(request)
+
+    revoke_tokens(validated_token)
+    with django_assert_num_queries(0):
+        with pytest.raises(AuthenticationFailed) as error:
+            CustomAuthentication().authenticate(request)
+    assert error.value.detail == TOKEN_REVOKED_ERROR_MESSAGE
+
+def test_authenticate_revoked_elsewhere(client, user1):
+    token = login(client, user1.email)
+    request = RequestFactory().get('/', headers={'AUTHORIZATION': f'Bearer {token}'})
+    _, validated_token = CustomAuthentication().authenticate(request)
+
+    # revoked by another process: seen here from the next sync on
+    RevokedToken.objects.create(
+        jti=validated_token['jti'],
+        expires=timezone.now() + datetime.timedelta(minutes=5),
+    )
+    CustomAuthentication().authenticate(request)
+    sync_revoked_tokens(force=True)
+    with pytest.raises(AuthenticationFailed):
+        CustomAuthentication().authenticate(request)
@@ -0,0 +1,32 @@
+import io
+from django.core.management import call_command
+from authenticate.models import AccountDeletion, CustomUser, get_sentinel_user
+from horoscope.models import SIGNS, DailyHoroscope, DailyHoroscopeEntry, Horoscope, ReportHoroscope
+
+def test_delete_pending_accounts(user1, user2):
+    horoscopes = Horoscope.objects.bulk_create([
+        Horoscope(poster=user2, horoscope=f'Horoscope {i}.') for i in range(20)
+    ])
+    ReportHoroscope.objects.create(reported_horoscope=horoscopes[-1], reason='Spam')
+    # the first twelve are in a daily horoscope
+    DailyHoroscope.objects.create(**dict(zip(SIGNS, horoscopes)))
+    kept = Horoscope.objects.create(poster=user1, horoscope='Not going anywhere.')
+
+    user2.is_active = False
+    user2.save()
+    AccountDeletion.objects.create(user=user2)
+
+    out = io.StringIO()
+    call_command('delete_pending_accounts', '--batch-size=5', '--sleep=0', stdout=out)
+    assert '8 horoscope(s) deleted, 12 kept' in out.getvalue()
+
+    assert not CustomUser.objects.filter(id=user2.id).exists()
+    assert not AccountDeletion.objects.exists()
+    assert not ReportHoroscope.objects.exists()
+    assert Horoscope.objects.filter(poster=get_sentinel_user()).count() == 12
+    assert DailyHoroscopeEntry.objects.filter(horoscope__poster=get_sentinel_user()).count() == 12
+    assert Horoscope.objects.filter(id=kept.id).exists()
+
+def test_delete_pending_accounts_nothing_pending(user1):
+    call_command('delete_pending_accounts', stdout=io.StringIO())
+    assert CustomUser.objects.filter(id=user1.id).exists()
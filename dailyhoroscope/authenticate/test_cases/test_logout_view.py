@@ -26,6 +26,13 @@ def test_post(client, user1):
     assert response.client.cookies[settings.SIMPLE_JWT['AUTH_COOKIE']].value == ''
     assert response.status_code == 200
 
+    # the access token stops working too, not just the cookie
+    response = client.get(
+        reverse('profile_view'),
+        headers={'AUTHORIZATION': f'Bearer {token}'}
+    )
+    assert response.status_code == 401
+
 @pytest.mark.django_db
 def test_post_no_token(client, user1):
     data = {
@@ -66,3 +73,11 @@ def test_post_no_refresh(client, user1):
     results = json.loads(response.content.decode('utf-8'))
     assert results['message'] == 'User already logged out.'
     assert response.status_code == 401
+
+@pytest.mark.parametrize('name', [
+    'refresh_view', 'logout_view', 'change_password_view', 'reset_password-view', 'async_change_password_view',
+])
+def test_refresh_cookie_path(name):
+    # browsers only send the refresh cookie under its path (the test client ignores it),
+    # and every view that revokes the refresh token needs to receive it
+    assert reverse(name).startswith(settings.SIMPLE_JWT['AUTH_COOKIE_PATH'])
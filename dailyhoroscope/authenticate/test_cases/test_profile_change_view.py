@@ -1,8 +1,11 @@
+import io
 import json
 import pytest
+from django.conf import settings
+from django.core.management import call_command
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
-from authenticate.models import CustomUser
+from authenticate.models import AccountDeletion, CustomUser, RevokedToken
 
 def test_get(client, profile2):
     prof, _ = profile2
@@ -117,7 +120,23 @@ def test_delete(client, profile2):
     assert response.status_code == 202
     assert results['message'] == 'User successfully deleted.'
 
+    # closed at once, removed by delete_pending_accounts
+    user = CustomUser.objects.get(username='ichiban')
+    assert not user.is_active
+    assert AccountDeletion.objects.filter(user=user).exists()
+    # the access token and the refresh cookie are revoked for every process, not just this one
+    assert reverse('profile_view').startswith(settings.SIMPLE_JWT['AUTH_COOKIE_PATH'])
+    assert RevokedToken.objects.count() == 2
+
+    response = client.get(
+        reverse('profile_view'),
+        headers={'AUTHORIZATION': f'Bearer {token}'}
+    )
+    assert response.status_code == 401
+
+    call_command('delete_pending_accounts', '--sleep=0', stdout=io.StringIO())
     assert not CustomUser.objects.filter(username='ichiban').exists()
+    assert not AccountDeletion.objects.exists()
 
 def test_delete_unauthenticated(client):
     response = client.delete(
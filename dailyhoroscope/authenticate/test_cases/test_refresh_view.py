@@ -32,3 +32,34 @@ def test_post_invalid_token(client, user1):
     results = json.loads(response.content.decode('utf-8'))
     assert response.status_code == 401
     assert results['message'] == 'Invalid token submitted.'
+
+def test_post_replaced_token(client, user1):
+    sleep(1)
+    response = client.post(
+        reverse('login_view'),
+        data={'username': 'kazumakiryu@rgg.com', 'password': 'Password123!'}
+    )
+    old_token = response.client.cookies[settings.SIMPLE_JWT['AUTH_COOKIE']].value
+    response = client.post(reverse('refresh_view'))
+    assert response.status_code == 200
+
+    # refreshing does not revoke the old token, so another tab still holding it can refresh too
+    client.cookies[settings.SIMPLE_JWT['AUTH_COOKIE']] = old_token
+    response = client.post(reverse('refresh_view'))
+    assert response.status_code == 200
+
+def test_post_after_logout(client, user1):
+    response = client.post(
+        reverse('login_view'),
+        data={'username': 'kazumakiryu@rgg.com', 'password': 'Password123!'}
+    )
+    results = json.loads(response.content.decode('utf-8'))
+    refresh_token = results['data']['refresh']
+    response = client.post(reverse('logout_view'), headers={'AUTHORIZATION': f'Bearer {results["data"]["access"]}'})
+    assert response.status_code == 200
+
+    client.cookies[settings.SIMPLE_JWT['AUTH_COOKIE']] = refresh_token
+    response = client.post(reverse('refresh_view'))
+    results = json.loads(response.content.decode('utf-8'))
+    assert response.status_code == 401
+    assert results['message'] == 'Token has been revoked. Please login again.'
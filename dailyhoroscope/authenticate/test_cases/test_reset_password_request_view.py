@@ -0,0 +1,31 @@
+import json
+import pytest
+from django.core import mail
+from django.urls import reverse
+from authenticate.models import OutgoingEmail
+
+def test_post(client, user1):
+    response = client.post(
+        reverse('reset_password-request-view'),
+        data={'email': 'kazumakiryu@rgg.com', 'date_of_birth': '2000-01-01'}
+    )
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert results['message'] == 'Password reset email has been sent.'
+
+    # queued for the outbox worker instead of sent inside the request
+    assert len(mail.outbox) == 0
+    email = OutgoingEmail.objects.get()
+    assert email.to == 'kazumakiryu@rgg.com'
+    assert email.subject == 'Password Reset'
+    assert email.date_sent is None
+
+def test_post_incorrect_date_of_birth(client, user1):
+    response = client.post(
+        reverse('reset_password-request-view'),
+        data={'email': 'kazumakiryu@rgg.com', 'date_of_birth': '2000-01-02'}
+    )
+
+    assert response.status_code == 400
+    assert not OutgoingEmail.objects.exists()
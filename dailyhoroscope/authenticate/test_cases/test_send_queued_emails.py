@@ -0,0 +1,93 @@
+import smtplib
+import pytest
+from unittest import mock
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+from authenticate.email import queue_email, send_queued_emails
+from authenticate.models import OutgoingEmail
+
+@pytest.mark.django_db
+def test_send_queued_emails():
+    queue_email('Hello', 'First', 'first@example.com')
+    queue_email('Hello', 'Second', 'second@example.com')
+
+    call_command('send_queued_emails')
+
+    assert [message.to for message in mail.outbox] == [['first@example.com'], ['second@example.com']]
+    assert not OutgoingEmail.objects.filter(date_sent__isnull=True).exists()
+    # sent bodies are cleared, they may hold reset tokens
+    assert set(OutgoingEmail.objects.values_list('body', flat=True)) == {''}
+    assert [message.body for message in mail.outbox] == ['First', 'Second']
+
+    # already sent mail is never sent again
+    call_command('send_queued_emails')
+    assert len(mail.outbox) == 2
+
+@pytest.mark.django_db
+def test_send_queued_emails_retry(settings):
+    settings.EMAIL_OUTBOX_RETRY_DELAY = 60
+    email = queue_email('Hello', 'First', 'first@example.com')
+
+    with mock.patch('django.core.mail.EmailMessage.send', side_effect=OSError('Connection refused')):
+        assert send_queued_emails() == (0, 1)
+
+    email.refresh_from_db()
+    assert email.date_sent is None
+    assert email.attempts == 1
+    assert email.last_error == 'Connection refused'
+    assert email.next_attempt > timezone.now()
+
+    # not due yet
+    assert send_queued_emails() == (0, 0)
+
+    OutgoingEmail.objects.update(next_attempt=timezone.now())
+    assert send_queued_emails() == (1, 0)
+    assert len(mail.outbox) == 1
+
+@pytest.mark.django_db
+def test_send_queued_emails_max_attempts():
+    queue_email('Hello', 'First', 'first@example.com')
+    OutgoingEmail.objects.update(attempts=5)
+
+    assert send_queued_emails(max_attempts=5) == (0, 0)
+    assert len(mail.outbox) == 0
+
+@pytest.mark.django_db
+def test_send_queued_emails_reconnects():
+    queue_email('Hello', 'First', 'first@example.com')
+    queue_email('Hello', 'Second', 'second@example.com')
+
+    # already open and owned by the caller, like the worker's connection
+    connection = mock.MagicMock()
+    connection.open.return_value = False
+    connection.send_messages.side_effect = [smtplib.SMTPServerDisconnected('Connection unexpectedly closed'), 1]
+    assert send_queued_emails(connection=connection) == (1, 1)
+
+    # the broken connection is not reused for the rest of the batch
+    connection.close.assert_called_once()
+    assert connection.open.call_count == 2
+
+@pytest.mark.django_db
+def test_send_queued_emails_idle_connection():
+    # the worker only holds a connection while it has mail to send
+    with mock.patch('django.core.mail.backends.locmem.EmailBackend.open') as open_connection:
+        call_command('send_queued_emails')
+    open_connection.assert_not_called()
+
+@pytest.mark.django_db
+def test_send_queued_emails_unreachable(settings):
+    settings.EMAIL_OUTBOX_RETRY_DELAY = 60
+    queue_email('Hello', 'First', 'first@example.com')
+    queue_email('Hello', 'Second', 'second@example.com')
+
+    connection = mock.MagicMock()
+    connection.open.side_effect = ConnectionRefusedError('Connection refused')
+    assert send_queued_emails(connection=connection) == (0, 2)
+
+    # every claimed email backs off with the error recorded, none stays silently leased
+    for email in OutgoingEmail.objects.all():
+        assert email.attempts == 1
+        assert email.last_error == 'Connection refused'
+        assert email.next_attempt > timezone.now()
+    assert len(mail.outbox) == 0
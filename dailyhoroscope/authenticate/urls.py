@@ -1,5 +1,5 @@
 from django.urls import path
-from authenticate import views
+from authenticate import async_views, views
 from rest_framework.urlpatterns import format_suffix_patterns
 
 urlpatterns = [
@@ -12,5 +12,9 @@ urlpatterns = [
     path('refresh', views.RefreshView.as_view(), name='refresh_view'),
     path('logout', views.LogoutView.as_view(), name='logout_view'),
     path('profile', views.ProfileChangesView.as_view(), name='profile_view'),
+    # same views with password hashing in a bounded thread pool, for serving under asgi.py
+    path('async/register', async_views.register_view, name='async_register_view'),
+    path('async/login', async_views.login_view, name='async_login_view'),
+    path('async/change-password', async_views.change_password_view, name='async_change_password_view'),
     path('termsofservice', views.TermsOfServiceView.as_view(), name='terms_of_service_view'),
 ]
@@ -2,22 +2,33 @@ import datetime
 from django.conf import settings
 from django.contrib.auth import authenticate
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404, render
 from django.utils import timezone
 from django.utils.html import escape
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.views import APIView
-from .authentication import PASSWORD_CHANGED_ERROR_MESSAGE
+from .authentication import PASSWORD_CHANGED_ERROR_MESSAGE, TOKEN_REVOKED_ERROR_MESSAGE, is_token_revoked, revoke_tokens
 from .email import send_reset_email, ResetToken
-from .models import CustomUser
+from .models import AccountDeletion, CustomUser
 from .verifier import RegisterVerifier
 
 REFRESH_TOKEN_EXPIRED_MESSAGE = 'Refresh token has expired. Please login again.'
 
+def get_cookie_refresh_token(request):
+    # the refresh token from the cookie, or None if there is none or it is no longer valid
+    raw_token = request.COOKIES.get(settings.SIMPLE_JWT['AUTH_COOKIE']) or None
+    if raw_token is None:
+        return None
+    try:
+        return RefreshToken(raw_token)
+    except TokenError:
+        return None
+
 def get_tokens_for_user(user):
     refresh = RefreshToken.for_user(user)
     # print(datetime.fromtimestamp(refresh['exp'], tz=timezone.utc))
@@ -121,7 +132,11 @@ class RefreshView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        # TODO: blacklist here
+        if is_token_revoked(token):
+            return Response(
+                {'message': TOKEN_REVOKED_ERROR_MESSAGE},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
         jwt = JWTAuthentication()
         user = jwt.get_user(token)
         if issue_date < user.last_password_change:
@@ -195,7 +210,15 @@ class ProfileChangesView(APIView):
     
     def delete(self, request):
         try:
-            request.user.delete()
+            # the account is closed at once, its content is deleted in batches by delete_pending_accounts.
+            # This session's tokens are revoked outright; refresh tokens of other sessions fail on the
+            # inactive user, their access tokens for up to AUTH_USER_STATE_TTL in other processes
+            user = request.user
+            with transaction.atomic():
+                user.is_active = False
+                user.save(update_fields=['is_active'])
+                AccountDeletion.objects.get_or_create(user=user)
+                revoke_tokens(request.auth, get_cookie_refresh_token(request))
             return Response(
                 {'message': 'User successfully deleted.'}, 
                 status=status.HTTP_202_ACCEPTED
@@ -241,6 +264,7 @@ class ChangePasswordView(APIView):
         user.set_password(new_password)
         user.last_password_change = timezone.now()
         user.save()
+        revoke_tokens(request.auth, get_cookie_refresh_token(request))
         
         data = get_tokens_for_user(user)
 
@@ -314,6 +338,7 @@ class ResetPasswordView(APIView):
         user.set_password(new_password)
         user.last_password_change = timezone.now()
         user.save()
+        revoke_tokens(request.auth, get_cookie_refresh_token(request))
 
         return Response(
             {'message': 'Password changed successfully.'},
@@ -330,6 +355,7 @@ class LogoutView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
+        revoke_tokens(request.auth, get_cookie_refresh_token(request))
         response = Response(
             {'message': 'Successfully logged out.'},
             status=status.HTTP_200_OK,
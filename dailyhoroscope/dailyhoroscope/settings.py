@@ -97,6 +97,49 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# locmem by default, e.g. CACHE_URL=rediscache://127.0.0.1:6379/1 for a shared cache
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+# cache backends that each process keeps to itself: a change only clears the cache of the
+# process that made it, so other workers and management commands go unnoticed until expiry
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+SHARED_CACHE = CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHE_BACKENDS
+
+# payloads are fresh for DAILY_HOROSCOPE_CACHE_TIMEOUT, then served stale for up to
+# DAILY_HOROSCOPE_STALE_TIMEOUT more while a single request rebuilds them. Without a shared
+# cache both are kept short, so stale content from another process lasts at most two minutes
+DAILY_HOROSCOPE_CACHE_TIMEOUT = 60 * 60 * 24 if SHARED_CACHE else 60
+DAILY_HOROSCOPE_STALE_TIMEOUT = 60 * 60 if SHARED_CACHE else 60
+DAILY_HOROSCOPE_LOCK_TIMEOUT = 10
+# how long a day without a published daily horoscope is remembered as missing
+DAILY_HOROSCOPE_MISS_TIMEOUT = 60
+DAILY_HOROSCOPE_MAX_RANGE_DAYS = 31
+
+# Custom: Horoscope listings
+HOROSCOPE_PAGE_SIZE = 20
+HOROSCOPE_MAX_PAGE_SIZE = 100
+# most horoscopes a single POST to horoscope_view may upload
+HOROSCOPE_BULK_CREATE_MAX = 1000
+# most ids a single GET to horoscope_view may ask for
+HOROSCOPE_BATCH_GET_MAX = 100
+
+# Cache-Control directives per read endpoint, so CDNs can absorb repeated reads
+HOROSCOPE_CACHE_CONTROL = {
+    'horoscope': {'public': True, 'max_age': 60},
+    'user': {'public': True, 'max_age': 30},
+    'daily': {'public': True, 'max_age': 300},
+    'daily_past': {'public': True, 'max_age': 60 * 60 * 24},
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -141,6 +184,19 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Custom: Authentication
 AUTH_USER_MODEL = "authenticate.CustomUser"
 
+# cached (is_active, last_password_change) used to check tokens; set the alias of a
+# shared cache in CACHES to share it between processes instead of keeping it per process
+AUTH_USER_STATE_CACHE = None
+AUTH_USER_STATE_TTL = 60
+# users kept in each process's cache, the least recently used are evicted beyond it
+AUTH_USER_STATE_MAX_ENTRIES = 10000
+# how often each process picks up tokens revoked by logouts and password changes
+AUTH_REVOKED_TOKEN_SYNC_INTERVAL = 30
+# threads hashing passwords for the async login, register and change-password views,
+# and how many more requests may wait for one before they are turned away with a 503
+AUTH_HASHING_WORKERS = 4
+AUTH_HASHING_QUEUE = 16
+
 CORS_ALLOWED_ORIGINS = ['http://127.0.0.1:8000']
 CORS_ALLOW_CREDENTIALS = True
 
@@ -187,7 +243,8 @@ SIMPLE_JWT = {
     'AUTH_COOKIE_DOMAIN': None,
     'AUTH_COOKIE_SECURE': False,
     'AUTH_COOKIE_HTTP_ONLY': True,
-    'AUTH_COOKIE_PATH': '/auth/refresh',
+    # every /auth/ endpoint, so logout and the password views receive the refresh token to revoke it
+    'AUTH_COOKIE_PATH': '/auth/',
     'AUTH_COOKIE_SAMESITE': 'Lax',
 }
 
@@ -207,3 +264,8 @@ EMAIL_PORT = 587
 EMAIL_HOST_USER = env('APPLICATION_EMAIL_ADDRESS')
 EMAIL_HOST_PASSWORD = env('APPLICATION_EMAIL_PASSWORD')
 EMAIL_USE_TLS = True
+
+# outbox drained by the send_queued_emails command; retries back off exponentially from EMAIL_OUTBOX_RETRY_DELAY
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+EMAIL_OUTBOX_LEASE = 5 * 60
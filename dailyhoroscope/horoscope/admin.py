@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Horoscope, DailyHoroscope, ReportHoroscope
+from .models import Horoscope, DailyHoroscope, DailyHoroscopeEntry, DailyHoroscopeSnapshot, ReportHoroscope
 
 # Register your models here.
 @admin.register(Horoscope)
@@ -14,6 +14,18 @@ class DailyHoroscopeAdmin(admin.ModelAdmin):
         "id", "date"
     ]
 
+@admin.register(DailyHoroscopeEntry)
+class DailyHoroscopeEntryAdmin(admin.ModelAdmin):
+    list_display = [
+        "id", "date", "sign", "horoscope"
+    ]
+
+@admin.register(DailyHoroscopeSnapshot)
+class DailyHoroscopeSnapshotAdmin(admin.ModelAdmin):
+    list_display = [
+        "id", "date", "date_frozen"
+    ]
+
 @admin.register(ReportHoroscope)
 class HoroscopeAdmin(admin.ModelAdmin):
     list_display = [
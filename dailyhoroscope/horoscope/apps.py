@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class HoroscopeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'horoscope'
+
+    def ready(self):
+        import horoscope.signals
@@ -0,0 +1,146 @@
+import gzip
+import logging
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from .conditional import make_etag
+from .models import SIGNS, DailyHoroscopeEntry, DailyHoroscopeSnapshot
+from .snapshots import read_snapshot
+
+DAILY_CACHE_PREFIX = 'horoscope:daily'
+REBUILD_LOCK_STRIPES = 64
+
+logger = logging.getLogger(__name__)
+
+# per-process rebuild locks, so concurrent misses in one process wait on a single rebuild;
+# keys are striped over a fixed set since the date in them comes from the request
+_rebuild_locks = [threading.Lock() for _ in range(REBUILD_LOCK_STRIPES)]
+
+def daily_cache_key(date=None, sign=None):
+    # date of None is the most recent daily horoscope, sign of None is every sign
+    key = f'{DAILY_CACHE_PREFIX}:{date.isoformat() if date else "latest"}'
+    return key if sign is None else f'{key}:{sign}'
+
+def build_daily_payload(body):
+    # any change to the day drops the payload, so the build time is a safe Last-Modified;
+    # the body is compressed once here instead of on every response
+    return {
+        'body': body,
+        'gzip': gzip.compress(body),
+        'etag': make_etag(body.decode('utf-8')),
+        'last_modified': timezone.now(),
+    }
+
+def get_rebuild_lock(key):
+    return _rebuild_locks[hash(key) % REBUILD_LOCK_STRIPES]
+
+def rebuild_daily_payload(key, date, sign):
+    payload = build_daily_payload(render_daily(date, sign))
+    # the payload outlives its freshness, so it can still be served stale while it is rebuilt
+    cache.set(key, payload, settings.DAILY_HOROSCOPE_CACHE_TIMEOUT + settings.DAILY_HOROSCOPE_STALE_TIMEOUT)
+    cache.set(f'{key}:fresh', True, settings.DAILY_HOROSCOPE_CACHE_TIMEOUT)
+    return payload
+
+def get_daily_payload(date=None, sign=None):
+    # raises DailyHoroscopeEntry.DoesNotExist if there is nothing to serve
+    if date is not None:
+        return get_cached_payload(daily_cache_key(date, sign), date, sign)
+
+    # today's payload is warmed ahead of time by publish_daily_horoscope, so the first
+    # request after rollover is a cache hit; the latest published day is the fallback
+    today = timezone.now().date()
+    today_key = daily_cache_key(today, sign)
+    if cache.get(f'{today_key}:missing') is None:
+        try:
+            return get_cached_payload(today_key, today, sign)
+        except DailyHoroscopeEntry.DoesNotExist:
+            # remembered for a short while, so a day nobody published does not send every
+            # request through the rebuild lock and the database before the fallback
+            cache.set(f'{today_key}:missing', True, settings.DAILY_HOROSCOPE_MISS_TIMEOUT)
+    return get_cached_payload(daily_cache_key(None, sign), None, sign)
+
+def warm_daily(date):
+    # renders and stores the whole day, every sign, and their compressed variants
+    for sign in [None, *SIGNS]:
+        key = daily_cache_key(date, sign)
+        rebuild_daily_payload(key, date, sign)
+        cache.delete(f'{key}:missing')
+
+def get_cached_payload(key, date, sign):
+    lock_key = f'{key}:lock'
+    values = cache.get_many([key, f'{key}:fresh'])
+    payload = values.get(key)
+    if payload is not None and f'{key}:fresh' in values:
+        return payload
+
+    if payload is not None:
+        # stale: whoever takes the lock rebuilds, everyone else keeps serving the old payload
+        process_lock = get_rebuild_lock(key)
+        if not process_lock.acquire(blocking=False):
+            return payload
+        try:
+            if not cache.add(lock_key, True, settings.DAILY_HOROSCOPE_LOCK_TIMEOUT):
+                return payload
+            try:
+                return rebuild_daily_payload(key, date, sign)
+            except DailyHoroscopeEntry.DoesNotExist:
+                # the day is gone, not just unreachable, so its old content must not be served
+                cache.delete(key)
+                raise
+            except Exception:
+                # a transient database or cache error: the stale payload is still better than an error
+                logger.exception('Rebuilding %s failed, serving the stale payload.', key)
+                return payload
+            finally:
+                cache.delete(lock_key)
+        finally:
+            process_lock.release()
+
+    # nothing to serve at all: wait for a rebuild already in flight rather than starting another
+    with get_rebuild_lock(key):
+        payload = cache.get(key)
+        if payload is not None:
+            return payload
+        deadline = time.monotonic() + settings.DAILY_HOROSCOPE_LOCK_TIMEOUT
+        while not cache.add(lock_key, True, settings.DAILY_HOROSCOPE_LOCK_TIMEOUT):
+            # another process is rebuilding; give up waiting on it after the lock timeout
+            if time.monotonic() > deadline:
+                break
+            time.sleep(0.05)
+            payload = cache.get(key)
+            if payload is not None:
+                return payload
+        try:
+            return rebuild_daily_payload(key, date, sign)
+        finally:
+            cache.delete(lock_key)
+
+def render_daily(date=None, sign=None):
+    # past days are read from their frozen snapshot when there is one
+    if date is not None and date < timezone.now().date():
+        body = read_snapshot(date, sign)
+        if body is not None:
+            return body
+
+    entries = list(DailyHoroscopeEntry.objects.day(date, sign))
+    if not entries:
+        raise DailyHoroscopeEntry.DoesNotExist
+    return JSONRenderer().render(DailyHoroscopeEntry.serialize_day(entries[0].date, entries))
+
+def invalidate_daily(dates=()):
+    # the "latest" payloads may point at any of the given dates, so always mark them stale;
+    # only the freshness markers go, so the old payloads can be served while they are rebuilt.
+    # frozen snapshots of the dates are dropped too and re-frozen by freeze_daily_horoscopes,
+    # and a day that was missing is looked up again
+    dates = list(dates)
+    keys = []
+    for date in [None, *dates]:
+        for sign in [None, *SIGNS]:
+            key = daily_cache_key(date, sign)
+            keys.extend([f'{key}:fresh', f'{key}:missing'])
+    cache.delete_many(keys)
+    if dates:
+        DailyHoroscopeSnapshot.objects.filter(date__in=dates).delete()
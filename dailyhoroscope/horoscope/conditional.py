@@ -0,0 +1,25 @@
+import hashlib
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+def make_etag(*parts):
+    raw = '|'.join(str(part) for part in parts)
+    return f'"{hashlib.md5(raw.encode("utf-8")).hexdigest()}"'
+
+def conditional_response(request, build_response, etag=None, last_modified=None, cache_control=None):
+    # decide on a 304 from the validators alone, and only build the body when it is actually sent
+    timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = build_response()
+    if response.status_code not in (200, 304):
+        return response
+
+    if etag is not None:
+        response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    if cache_control is not None:
+        patch_cache_control(response, **settings.HOROSCOPE_CACHE_CONTROL[cache_control])
+    return response
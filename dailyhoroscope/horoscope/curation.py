@@ -0,0 +1,124 @@
+import datetime
+import random
+from django.db import transaction
+from django.db.models import Exists, Max, Min, OuterRef
+from authenticate.models import get_sentinel_user
+from .cache import invalidate_daily
+from .models import SIGNS, DailyHoroscope, DailyHoroscopeEntry, Horoscope, ReportHoroscope
+
+# random ids drawn per horoscope still needed, to make up for gaps in the id sequence
+OVERSAMPLE = 3
+SAMPLE_ROUNDS = 5
+# keeps IN lists well under every backend's parameter limit
+QUERY_CHUNK_SIZE = 5000
+
+def eligible_horoscopes(sentinel):
+    # never reported, posted by an active user, and not the placeholder for deleted content;
+    # the sentinel user is resolved once by the caller rather than on every query
+    reports = ReportHoroscope.objects.filter(reported_horoscope=OuterRef('pk'))
+    return Horoscope.objects.filter(poster__is_active=True).exclude(
+        poster=sentinel
+    ).exclude(Exists(reports))
+
+def recently_used_ids(start, recent_days):
+    return set(DailyHoroscopeEntry.objects.filter(
+        date__gte=start - datetime.timedelta(days=recent_days),
+        date__lt=start,
+    ).values_list('horoscope_id', flat=True))
+
+def filter_eligible(ids, sentinel):
+    found = set()
+    ids = list(ids)
+    for i in range(0, len(ids), QUERY_CHUNK_SIZE):
+        found.update(eligible_horoscopes(sentinel).filter(
+            id__in=ids[i:i + QUERY_CHUNK_SIZE]
+        ).values_list('id', flat=True))
+    return found
+
+def scan_eligible_ids(count, skip, pivot, sentinel):
+    # eligible ids in id order from pivot up, wrapping around to the lowest id, reading
+    # only as many rows as it takes to find count ids that are not skipped
+    found = []
+    eligible = eligible_horoscopes(sentinel).order_by('id')
+    for ids in (eligible.filter(id__gte=pivot), eligible.filter(id__lt=pivot)):
+        last = None
+        while len(found) < count:
+            page = ids if last is None else ids.filter(id__gt=last)
+            batch = list(page.values_list('id', flat=True)[:QUERY_CHUNK_SIZE])
+            if not batch:
+                break
+            found += [hid for hid in batch if hid not in skip][:count - len(found)]
+            last = batch[-1]
+    return found
+
+def sample_eligible_ids(count, exclude=(), rng=random, sentinel=None):
+    # id-range sampling: draw random ids between the lowest and highest id and keep the
+    # eligible ones, so picking never sorts or scans the whole table
+    sentinel = sentinel or get_sentinel_user()
+    bounds = Horoscope.objects.aggregate(low=Min('id'), high=Max('id'))
+    if bounds['low'] is None:
+        return []
+    exclude = set(exclude)
+    found = set()
+    span = bounds['high'] - bounds['low'] + 1
+    for _ in range(SAMPLE_ROUNDS):
+        missing = count - len(found)
+        if missing <= 0:
+            break
+        draws = min(missing * OVERSAMPLE, span)
+        candidates = {rng.randint(bounds['low'], bounds['high']) for _ in range(draws)}
+        found |= filter_eligible(candidates - found - exclude, sentinel)
+
+    if len(found) < count:
+        # sparse or small table: take the rest in id order from a random point, which
+        # reads about as many rows as are missing instead of every eligible id
+        pivot = rng.randint(bounds['low'], bounds['high'])
+        found.update(scan_eligible_ids(count - len(found), exclude | found, pivot, sentinel))
+    found = list(found)[:count]
+    rng.shuffle(found)
+    return found
+
+def curate_days(start, days, recent_days=30, rng=random):
+    # one {sign: horoscope id} dict per day, no horoscope repeated within a day
+    # or used again within recent_days of its last use
+    needed = len(SIGNS) * days
+    sentinel = get_sentinel_user()
+    recent = recently_used_ids(start, recent_days)
+    ids = sample_eligible_ids(needed, exclude=recent, rng=rng, sentinel=sentinel)
+    if len(ids) < needed:
+        # not enough distinct horoscopes for the whole run: also allow ones used recently,
+        # and cycle through them so reuses are spaced as far apart as possible
+        ids += sample_eligible_ids(needed - len(ids), exclude=ids, rng=rng, sentinel=sentinel)
+    if len(set(ids)) < len(SIGNS):
+        raise ValueError(f'At least {len(SIGNS)} eligible horoscopes are needed to curate a day.')
+
+    schedule = []
+    for day in range(days):
+        picks = [ids[(day * len(SIGNS) + i) % len(ids)] for i in range(len(SIGNS))]
+        schedule.append(dict(zip(SIGNS, picks)))
+    return schedule
+
+def create_curated_dailies(start, days, recent_days=30, rng=random):
+    # curates and inserts every missing day in one transaction, returning the created dailies
+    existing = set(DailyHoroscope.objects.filter(
+        date__gte=start, date__lt=start + datetime.timedelta(days=days)
+    ).values_list('date', flat=True))
+    dates = [start + datetime.timedelta(days=day) for day in range(days)]
+    dates = [date for date in dates if date not in existing]
+    if not dates:
+        return []
+
+    schedule = curate_days(start, len(dates), recent_days=recent_days, rng=rng)
+    with transaction.atomic():
+        dailies = DailyHoroscope.objects.bulk_create([
+            DailyHoroscope(date=date, **{f'{sign}_id': hid for sign, hid in signs.items()})
+            for date, signs in zip(dates, schedule)
+        ])
+        # bulk_create skips the signals that keep the entries in step
+        DailyHoroscopeEntry.objects.bulk_create([
+            DailyHoroscopeEntry(date=date, sign=sign, horoscope_id=hid)
+            for date, signs in zip(dates, schedule)
+            for sign, hid in signs.items()
+        ], batch_size=QUERY_CHUNK_SIZE)
+        transaction.on_commit(lambda: invalidate_daily(dates))
+    return dailies
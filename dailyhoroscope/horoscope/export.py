@@ -0,0 +1,59 @@
+import csv
+import datetime
+import json
+from django.utils import timezone
+from .models import Horoscope
+
+EXPORT_FIELDS = ('id', 'username', 'horoscope', 'date_posted', 'date_updated')
+EXPORT_FORMATS = ('ndjson', 'csv')
+EXPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+EXPORT_CHUNK_SIZE = 2000
+
+# date filters, each taking a datetime.date, mapped to their lookups on Horoscope;
+# "after" includes the day itself, "before" does not
+EXPORT_FILTERS = {
+    'posted_after': 'date_posted__gte',
+    'posted_before': 'date_posted__lt',
+    'updated_after': 'date_updated__gte',
+    'updated_before': 'date_updated__lt',
+}
+
+def start_of_day(date):
+    # compared as datetimes rather than with __date so the timestamp columns stay indexable
+    return timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+
+def export_rows(**filters):
+    # tuples in EXPORT_FIELDS order, read through a server-side cursor in id order
+    lookups = {
+        EXPORT_FILTERS[name]: start_of_day(value)
+        for name, value in filters.items() if value is not None
+    }
+    return Horoscope.objects.filter(**lookups).order_by('id').values_list(
+        'id', 'poster__username', 'horoscope', 'date_posted', 'date_updated'
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+def format_row(row):
+    hid, username, horoscope, date_posted, date_updated = row
+    return (hid, username, horoscope, date_posted.isoformat(), date_updated.isoformat())
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, format_row(row)))) + '\n'
+
+class Echo:
+    # csv.writer only needs something with a write() that hands back the line
+    def write(self, value):
+        return value
+
+def iter_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(format_row(row))
+
+def iter_export(output, **filters):
+    rows = export_rows(**filters)
+    return iter_csv(rows) if output == 'csv' else iter_ndjson(rows)
@@ -0,0 +1,39 @@
+import datetime
+import random
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from horoscope.curation import create_curated_dailies
+
+class Command(BaseCommand):
+    help = (
+        'Picks twelve eligible horoscopes for every day in a range that has no daily horoscope yet, '
+        'e.g. "manage.py curate_daily_horoscopes --days=365" to fill the coming year.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=datetime.date.fromisoformat, default=None,
+                            help='First day to curate (YYYY-MM-DD), defaults to tomorrow.')
+        parser.add_argument('--days', type=int, default=1,
+                            help='Number of days to curate.')
+        parser.add_argument('--recent-days', type=int, default=30,
+                            help='Skip horoscopes used within this many days before the start.')
+        parser.add_argument('--seed', type=int, default=None,
+                            help='Seed for the random picks, to make a run reproducible.')
+
+    def handle(self, *args, **options):
+        start = options['start'] or timezone.now().date() + datetime.timedelta(days=1)
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1.')
+
+        rng = random.Random(options['seed'])
+        began = time.monotonic()
+        try:
+            dailies = create_curated_dailies(start, options['days'], recent_days=options['recent_days'], rng=rng)
+        except ValueError as e:
+            raise CommandError(str(e))
+        elapsed = time.monotonic() - began
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Curated {len(dailies)} daily horoscope(s) from {start.isoformat()} in {elapsed:.2f}s.'
+        ))
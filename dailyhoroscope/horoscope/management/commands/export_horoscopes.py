@@ -0,0 +1,41 @@
+import datetime
+import time
+from django.core.management.base import BaseCommand
+from horoscope.export import EXPORT_FILTERS, EXPORT_FORMATS, iter_export
+
+class Command(BaseCommand):
+    help = (
+        'Streams every horoscope to a file or stdout as NDJSON or CSV without loading the table into memory, '
+        'e.g. "manage.py export_horoscopes --output=csv --file=horoscopes.csv".'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', choices=EXPORT_FORMATS, default='ndjson',
+                            help='Export format.')
+        parser.add_argument('--file', default=None,
+                            help='Path to write to, defaults to stdout.')
+        for name in EXPORT_FILTERS:
+            parser.add_argument(f'--{name.replace("_", "-")}', dest=name,
+                                type=datetime.date.fromisoformat, default=None,
+                                help=f'Only horoscopes {name.replace("_", " ")} this day (YYYY-MM-DD).')
+
+    def handle(self, *args, **options):
+        filters = {name: options[name] for name in EXPORT_FILTERS}
+        lines = iter_export(options['output'], **filters)
+        if not options['file']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        began = time.monotonic()
+        count = 0
+        with open(options['file'], 'w', newline='', encoding='utf-8') as f:
+            for line in lines:
+                f.write(line)
+                count += 1
+        elapsed = time.monotonic() - began
+        # the CSV header is not a horoscope
+        rows = count - 1 if options['output'] == 'csv' else count
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {rows} horoscope(s) to {options["file"]} in {elapsed:.2f}s.'
+        ))
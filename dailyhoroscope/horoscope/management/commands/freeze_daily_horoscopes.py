@@ -0,0 +1,33 @@
+import datetime
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from horoscope.models import DailyHoroscope, DailyHoroscopeSnapshot
+from horoscope.snapshots import freeze_days
+
+class Command(BaseCommand):
+    help = 'Freezes the rendered payload of past daily horoscopes into snapshots.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--before', type=datetime.date.fromisoformat, default=None,
+                            help='Freeze days before this date (YYYY-MM-DD), defaults to today.')
+        parser.add_argument('--refresh', action='store_true',
+                            help='Re-freeze days that already have a snapshot.')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        before = options['before'] or timezone.now().date()
+        dates = DailyHoroscope.objects.filter(date__lt=before).order_by('date')
+        if not options['refresh']:
+            dates = dates.exclude(date__in=DailyHoroscopeSnapshot.objects.values('date'))
+
+        frozen = 0
+        batch = []
+        for date in dates.values_list('date', flat=True).iterator(chunk_size=options['batch_size']):
+            batch.append(date)
+            if len(batch) >= options['batch_size']:
+                frozen += freeze_days(batch)
+                batch = []
+        if batch:
+            frozen += freeze_days(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Froze {frozen} daily horoscope(s).'))
@@ -0,0 +1,119 @@
+import csv
+import io
+import itertools
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.html import escape
+from authenticate.models import CustomUser
+from horoscope.models import Horoscope
+
+# usernames resolved per query, well under every backend's parameter limit
+LOOKUP_CHUNK_SIZE = 5000
+
+class Command(BaseCommand):
+    help = (
+        'Loads horoscopes from an NDJSON or CSV file with "username" and "horoscope" fields, '
+        'through COPY on PostgreSQL and chunked bulk_create elsewhere. '
+        'Text is HTML-escaped exactly like uploads through horoscope_view.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help='Path of the file to import.')
+        parser.add_argument('--input', choices=('ndjson', 'csv'), default=None,
+                            help='File format, guessed from the extension by default.')
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help='Rows sent to the database per COPY or INSERT.')
+        parser.add_argument('--skip-unknown', action='store_true',
+                            help='Skip rows whose username does not exist instead of failing.')
+
+    def handle(self, *args, **options):
+        path = options['file']
+        fmt = options['input'] or ('csv' if path.endswith('.csv') else 'ndjson')
+
+        # first pass only collects usernames, so they are resolved in a few queries up front
+        usernames = {row['username'] for row in self.read_rows(path, fmt)}
+        user_ids = self.resolve_usernames(usernames)
+        unknown = usernames - user_ids.keys()
+        if unknown and not options['skip_unknown']:
+            shown = ', '.join(sorted(unknown)[:10])
+            raise CommandError(f'{len(unknown)} unknown username(s), e.g. {shown}. Use --skip-unknown to skip them.')
+
+        # every imported row counts as posted now, like an upload through the API
+        now = timezone.now()
+        rows = (
+            (user_ids[row['username']], escape(row['horoscope']), now, now)
+            for row in self.read_rows(path, fmt)
+            if row['username'] in user_ids
+        )
+
+        start = time.monotonic()
+        loaded = 0
+        with transaction.atomic():
+            load = self.copy_chunk if connection.vendor == 'postgresql' else self.create_chunk
+            while True:
+                chunk = list(itertools.islice(rows, options['chunk_size']))
+                if not chunk:
+                    break
+                load(chunk)
+                loaded += len(chunk)
+        elapsed = time.monotonic() - start
+
+        rate = loaded / elapsed if elapsed else loaded
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {loaded} horoscope(s) in {elapsed:.2f}s ({rate:.0f} rows/sec).'
+        ))
+
+    def read_rows(self, path, fmt):
+        with open(path, newline='', encoding='utf-8') as f:
+            if fmt == 'csv':
+                rows = csv.DictReader(f)
+            else:
+                rows = (self.parse_json(number, line) for number, line in enumerate(f, start=1) if line.strip())
+            for number, row in enumerate(rows, start=1):
+                if not isinstance(row, dict) or not row.get('username') or not isinstance(row.get('horoscope'), str):
+                    raise CommandError(f'Row {number} must have a "username" and a "horoscope".')
+                yield row
+
+    def parse_json(self, number, line):
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError as e:
+            raise CommandError(f'Line {number} is not valid JSON: {e}')
+
+    def resolve_usernames(self, usernames):
+        usernames = list(usernames)
+        user_ids = {}
+        for i in range(0, len(usernames), LOOKUP_CHUNK_SIZE):
+            user_ids.update(CustomUser.objects.filter(
+                username__in=usernames[i:i + LOOKUP_CHUNK_SIZE]
+            ).values_list('username', 'id'))
+        return user_ids
+
+    def copy_chunk(self, chunk):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows((poster_id, text, posted.isoformat(), updated.isoformat())
+                         for poster_id, text, posted, updated in chunk)
+        buffer.seek(0)
+        sql = (
+            f'COPY {Horoscope._meta.db_table} (poster_id, horoscope, date_posted, date_updated) '
+            # an empty unquoted field is NULL in CSV COPY, but an empty horoscope is just empty text
+            'FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (horoscope))'
+        )
+        with connection.cursor() as cursor:
+            if hasattr(cursor.cursor, 'copy_expert'):
+                # psycopg2
+                cursor.cursor.copy_expert(sql, buffer)
+            else:
+                # psycopg 3
+                with cursor.cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+    def create_chunk(self, chunk):
+        Horoscope.objects.bulk_create([
+            Horoscope(poster_id=poster_id, horoscope=text, date_posted=posted, date_updated=updated)
+            for poster_id, text, posted, updated in chunk
+        ])
@@ -0,0 +1,88 @@
+import datetime
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from horoscope.partitioning import (
+    PARTITIONED_MODELS, convert_table, create_partition, detach_partition, is_partitioned,
+    list_partitions, month_range, next_month, partition_in_use, partition_month,
+)
+
+class Command(BaseCommand):
+    help = (
+        'Opt-in monthly partitioning of the horoscope and report tables on PostgreSQL. '
+        '"convert" partitions the tables once, "create" adds partitions for the coming months '
+        '(schedule it monthly), "detach" takes old months out of the tables. '
+        'convert drops every foreign key that references either table (the daily horoscope signs, '
+        'the daily entries and the reports): a partitioned primary key includes the partition column, '
+        'which those tables do not have, so from then on only Django enforces those relations.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=('convert', 'create', 'detach'))
+        parser.add_argument('--months', type=int, default=3,
+                            help='With convert and create, months ahead of the current one to have partitions for.')
+        parser.add_argument('--before', type=datetime.date.fromisoformat, default=None,
+                            help='With detach, detach every month ending on or before this day (YYYY-MM-DD).')
+        parser.add_argument('--drop', action='store_true',
+                            help='With detach, drop the detached partitions instead of keeping them as tables.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Partitioning is only supported on PostgreSQL.')
+
+        until = timezone.now().date()
+        for _ in range(options['months']):
+            until = next_month(until)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            # deferred foreign key checks from rows written earlier in the transaction would make
+            # the ALTER TABLEs below fail with "pending trigger events", so run them now
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            if options['action'] == 'convert':
+                self.convert(cursor, until)
+            elif options['action'] == 'create':
+                self.create(cursor, until)
+            else:
+                if options['before'] is None:
+                    raise CommandError('detach needs --before.')
+                self.detach(cursor, options['before'], options['drop'])
+
+    def convert(self, cursor, until):
+        for model, column in PARTITIONED_MODELS:
+            table = model._meta.db_table
+            if is_partitioned(cursor, table):
+                self.stdout.write(f'{table} is already partitioned.')
+                continue
+            dropped = convert_table(cursor, model, column, until)
+            for referencing, name in dropped:
+                self.stdout.write(self.style.WARNING(
+                    f'Dropped foreign key {name} on {referencing}, it is now enforced by Django only.'
+                ))
+            self.stdout.write(self.style.SUCCESS(f'Partitioned {table} by month on {column}.'))
+
+    def create(self, cursor, until):
+        for model, column in PARTITIONED_MODELS:
+            table = model._meta.db_table
+            if not is_partitioned(cursor, table):
+                raise CommandError(f'{table} is not partitioned, run "partition_horoscopes convert" first.')
+            created = [
+                month for month in month_range(timezone.now().date(), until)
+                if create_partition(cursor, table, column, month)
+            ]
+            self.stdout.write(f'Created {len(created)} partition(s) for {table}.')
+
+    def detach(self, cursor, before, drop):
+        for model, _ in PARTITIONED_MODELS:
+            table = model._meta.db_table
+            if not is_partitioned(cursor, table):
+                raise CommandError(f'{table} is not partitioned, run "partition_horoscopes convert" first.')
+            for name in list_partitions(cursor, table):
+                month = partition_month(table, name)
+                if month is None or next_month(month) > before:
+                    continue
+                if partition_in_use(model, month):
+                    raise CommandError(
+                        f'{name} holds horoscopes still used by a daily horoscope or a report.'
+                    )
+                detach_partition(cursor, table, name, drop=drop)
+                self.stdout.write(f'{"Dropped" if drop else "Detached"} {name}.')
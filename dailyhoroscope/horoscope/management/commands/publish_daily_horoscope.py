@@ -0,0 +1,61 @@
+import datetime
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from horoscope.cache import warm_daily
+from horoscope.curation import create_curated_dailies
+from horoscope.models import SIGNS, DailyHoroscope, Horoscope
+
+class Command(BaseCommand):
+    help = (
+        'Creates a day\'s daily horoscope ahead of time and warms its cached payloads. '
+        'Schedule it before midnight UTC, e.g. "30 23 * * * manage.py publish_daily_horoscope". '
+        'Warming needs a shared cache (CACHE_URL), a process-local one is skipped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=datetime.date.fromisoformat, default=None,
+                            help='Day to publish (YYYY-MM-DD), defaults to tomorrow.')
+        parser.add_argument('--horoscopes', default=None,
+                            help=f'Comma-separated horoscope ids, in the order {", ".join(SIGNS)}, '
+                                 'for a day that does not exist yet. Curated automatically if omitted.')
+        parser.add_argument('--recent-days', type=int, default=30,
+                            help='When curating, skip horoscopes used within this many days.')
+
+    def handle(self, *args, **options):
+        date = options['date'] or timezone.now().date() + datetime.timedelta(days=1)
+
+        if DailyHoroscope.objects.filter(date=date).exists():
+            self.stdout.write(f'The daily horoscope for {date.isoformat()} already exists.')
+        elif options['horoscopes'] is None:
+            try:
+                create_curated_dailies(date, 1, recent_days=options['recent_days'])
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(f'Curated the daily horoscope for {date.isoformat()}.')
+        else:
+            DailyHoroscope.objects.create(date=date, **self.get_signs(options['horoscopes']))
+            self.stdout.write(f'Created the daily horoscope for {date.isoformat()}.')
+
+        if settings.SHARED_CACHE:
+            warm_daily(date)
+        else:
+            # this process's own cache is gone when the command exits, no web worker would read it
+            self.stderr.write(self.style.WARNING(
+                'The cache is local to this process, set a shared CACHE_URL to warm the daily horoscope.'
+            ))
+        self.stdout.write(self.style.SUCCESS(f'Published the daily horoscope for {date.isoformat()}.'))
+
+    def get_signs(self, horoscopes):
+        try:
+            ids = [int(hid) for hid in horoscopes.split(',')]
+        except ValueError:
+            raise CommandError('--horoscopes must be a comma-separated list of ids.')
+        if len(ids) != len(SIGNS):
+            raise CommandError(f'--horoscopes must contain exactly {len(SIGNS)} ids.')
+
+        found = Horoscope.objects.in_bulk(ids)
+        missing = [hid for hid in ids if hid not in found]
+        if missing:
+            raise CommandError(f'Horoscope(s) {", ".join(str(hid) for hid in missing)} do not exist.')
+        return {sign: found[hid] for sign, hid in zip(SIGNS, ids)}
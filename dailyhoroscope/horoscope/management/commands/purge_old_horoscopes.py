@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from horoscope.retention import purge_horoscopes, purge_reports
+
+class Command(BaseCommand):
+    help = (
+        'Deletes reviewed reports and, if asked, old horoscopes no daily horoscope uses, '
+        'in small batches with a pause between them, e.g. "manage.py purge_old_horoscopes --report-days=90".'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--report-days', type=int, default=90,
+                            help='Delete reviewed reports older than this many days.')
+        parser.add_argument('--horoscope-days', type=int, default=None,
+                            help='Delete horoscopes of deleted accounts posted more than this many days ago.')
+        parser.add_argument('--all-posters', action='store_true',
+                            help='With --horoscope-days, delete old horoscopes of every account.')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows deleted per transaction.')
+        parser.add_argument('--sleep', type=float, default=0.1,
+                            help='Seconds to pause between batches.')
+
+    def handle(self, *args, **options):
+        if options['all_posters'] and options['horoscope_days'] is None:
+            raise CommandError('--all-posters needs --horoscope-days.')
+        batching = {'batch_size': options['batch_size'], 'sleep': options['sleep']}
+
+        deleted = purge_reports(options['report_days'], progress=self.progress('reports'), **batching)
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} report(s).'))
+
+        if options['horoscope_days'] is not None:
+            deleted = purge_horoscopes(
+                options['horoscope_days'], all_posters=options['all_posters'],
+                progress=self.progress('horoscopes'), **batching
+            )
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} horoscope(s).'))
+
+    def progress(self, label):
+        def report(deleted, elapsed):
+            rate = deleted / elapsed if elapsed else deleted
+            self.stdout.write(f'{label}: {deleted} deleted ({rate:.0f} rows/sec)')
+        return report
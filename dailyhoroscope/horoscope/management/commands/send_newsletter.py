@@ -0,0 +1,91 @@
+import datetime
+import html
+import json
+import os
+import time
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand, CommandError
+from authenticate.models import UserProfile
+from horoscope.models import DATE_FORMAT, SIGNS, DailyHoroscope
+
+class Command(BaseCommand):
+    help = 'Sends the daily horoscope to every profile subscribed to the newsletter.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=datetime.date.fromisoformat, default=None,
+                            help='Date of the daily horoscope to send (YYYY-MM-DD), defaults to the most recent published.')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Subscribers fetched from the database per round-trip.')
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Emails handed to the mail connection at once.')
+        parser.add_argument('--checkpoint', default=None,
+                            help='File recording progress, so an interrupted run resumes where it stopped.')
+
+    def handle(self, *args, **options):
+        horoscopes = DailyHoroscope.objects.with_horoscopes().published()
+        try:
+            daily = horoscopes.latest('date') if options['date'] is None else horoscopes.get(date=options['date'])
+        except DailyHoroscope.DoesNotExist:
+            raise CommandError('There is no daily horoscope to send.')
+
+        # rendered once, every subscriber gets the same content
+        subject = f'Your Daily Horoscope for {daily.date.strftime(DATE_FORMAT)}'
+        body = self.render(daily)
+
+        checkpoint = options['checkpoint']
+        last_id = self.read_checkpoint(checkpoint, daily.date)
+        subscribers = UserProfile.objects.filter(
+            subscribed_to_newsletter=True,
+            user__is_active=True,
+            id__gt=last_id,
+        ).order_by('id').values_list('id', 'user__email')
+
+        sent = 0
+        start = time.monotonic()
+        batch = []
+        connection = get_connection()
+        connection.open()
+        try:
+            # streamed from a server-side cursor, the subscriber table is never loaded at once
+            for profile_id, email in subscribers.iterator(chunk_size=options['chunk_size']):
+                batch.append((profile_id, EmailMessage(subject, body, settings.EMAIL_HOST_USER, [email])))
+                if len(batch) >= options['batch_size']:
+                    sent += self.send_batch(connection, batch, checkpoint, daily.date)
+                    batch = []
+            if batch:
+                sent += self.send_batch(connection, batch, checkpoint, daily.date)
+        finally:
+            connection.close()
+
+        elapsed = time.monotonic() - start
+        rate = sent / elapsed if elapsed > 0 else 0
+        self.stdout.write(self.style.SUCCESS(f'Sent {sent} newsletter(s) in {elapsed:.2f}s ({rate:.1f} mails/sec).'))
+
+    def render(self, daily):
+        lines = [f'Daily Horoscopes for {daily.date.strftime(DATE_FORMAT)}', '']
+        for sign in SIGNS:
+            # horoscopes are stored html-escaped, the email is plain text
+            lines.append(f'{sign.capitalize()}: {html.unescape(getattr(daily, sign).horoscope)}')
+        return '\n'.join(lines)
+
+    def send_batch(self, connection, batch, checkpoint, date):
+        sent = connection.send_messages([message for _, message in batch]) or 0
+        self.write_checkpoint(checkpoint, date, batch[-1][0])
+        return sent
+
+    def read_checkpoint(self, checkpoint, date):
+        # a checkpoint for another day's newsletter starts from the beginning
+        if checkpoint is None or not os.path.exists(checkpoint):
+            return 0
+        with open(checkpoint) as file:
+            progress = json.load(file)
+        if progress.get('date') != date.isoformat():
+            return 0
+        return progress['last_profile_id']
+
+    def write_checkpoint(self, checkpoint, date, last_id):
+        if checkpoint is None:
+            return
+        with open(checkpoint, 'w') as file:
+            json.dump({'date': date.isoformat(), 'last_profile_id': last_id}, file)
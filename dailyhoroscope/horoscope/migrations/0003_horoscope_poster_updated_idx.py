@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('horoscope', '0002_alter_reporthoroscope_reported_horoscope'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='horoscope',
+            index=models.Index(fields=['poster', 'date_updated', 'id'], name='horoscope_poster_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+import datetime
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_dates(apps, schema_editor):
+    # the date becomes unique, so days with several daily horoscopes have to be resolved by hand
+    # first; nothing is deleted here, picking the row to keep is left to whoever owns the data
+    DailyHoroscope = apps.get_model('horoscope', 'DailyHoroscope')
+    duplicates = DailyHoroscope.objects.values('date').annotate(count=Count('id')).filter(count__gt=1)
+    dates = sorted(row['date'] for row in duplicates)
+    if not dates:
+        return
+    rows = list(DailyHoroscope.objects.filter(date__in=dates).order_by('date', 'id').values_list('date', 'id'))
+    listing = '\n'.join(f'  {date.isoformat()}: ids {", ".join(str(pk) for d, pk in rows if d == date)}' for date in dates)
+    raise RuntimeError(
+        f'{len(dates)} date(s) have more than one daily horoscope. Delete or move all but one '
+        f'daily horoscope per date, then run the migration again:\n{listing}'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('horoscope', '0003_horoscope_poster_updated_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_dates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='dailyhoroscope',
+            name='date',
+            field=models.DateField(default=datetime.date.today, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='reporthoroscope',
+            index=models.Index(condition=models.Q(('reviewed', False)), fields=['date_reported'], name='report_unreviewed_idx'),
+        ),
+    ]
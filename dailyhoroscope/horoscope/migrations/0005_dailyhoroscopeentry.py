@@ -0,0 +1,25 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('horoscope', '0004_daily_date_unique_report_unreviewed_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyHoroscopeEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('sign', models.CharField(choices=[('aries', 'Aries'), ('taurus', 'Taurus'), ('gemini', 'Gemini'), ('cancer', 'Cancer'), ('leo', 'Leo'), ('virgo', 'Virgo'), ('libra', 'Libra'), ('scorpio', 'Scorpio'), ('sagittarius', 'Sagittarius'), ('capricorn', 'Capricorn'), ('aquarius', 'Aquarius'), ('pisces', 'Pisces')], max_length=11)),
+                ('horoscope', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='horoscope.horoscope')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sign', 'date'], name='daily_entry_sign_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'sign'), name='daily_entry_date_sign_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+SIGNS = (
+    'aries', 'taurus', 'gemini', 'cancer', 'leo', 'virgo',
+    'libra', 'scorpio', 'sagittarius', 'capricorn', 'aquarius', 'pisces',
+)
+BATCH_SIZE = 1000
+
+
+def backfill_entries(apps, schema_editor):
+    DailyHoroscope = apps.get_model('horoscope', 'DailyHoroscope')
+    DailyHoroscopeEntry = apps.get_model('horoscope', 'DailyHoroscopeEntry')
+    columns = ['date'] + [f'{sign}_id' for sign in SIGNS]
+
+    entries = []
+    for row in DailyHoroscope.objects.values_list(*columns).iterator(chunk_size=BATCH_SIZE):
+        date, horoscope_ids = row[0], row[1:]
+        entries.extend(
+            DailyHoroscopeEntry(date=date, sign=sign, horoscope_id=horoscope_id)
+            for sign, horoscope_id in zip(SIGNS, horoscope_ids)
+        )
+        if len(entries) >= BATCH_SIZE:
+            DailyHoroscopeEntry.objects.bulk_create(entries, ignore_conflicts=True)
+            entries = []
+    DailyHoroscopeEntry.objects.bulk_create(entries, ignore_conflicts=True)
+
+
+def remove_entries(apps, schema_editor):
+    apps.get_model('horoscope', 'DailyHoroscopeEntry').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('horoscope', '0005_dailyhoroscopeentry'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_entries, remove_entries),
+    ]
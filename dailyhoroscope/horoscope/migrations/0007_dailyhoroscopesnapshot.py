@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('horoscope', '0006_backfill_dailyhoroscopeentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyHoroscopeSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('payload', models.TextField()),
+                ('date_frozen', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+import horoscope.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('horoscope', '0007_dailyhoroscopesnapshot'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailyhoroscopeentry',
+            name='horoscope',
+            field=models.ForeignKey(on_delete=horoscope.models.get_default_horoscope, related_name='+', to='horoscope.horoscope'),
+        ),
+    ]
@@ -1,18 +1,59 @@
+import datetime
 from django.db import models
+from django.utils import timezone
 from authenticate.models import CustomUser, get_sentinel_user
 
 DATE_FORMAT = '%Y/%m/%d'
 DATETIME_FORMAT = '%Y/%m/%d %H:%M'
+SIGNS = (
+    'aries', 'taurus', 'gemini', 'cancer', 'leo', 'virgo',
+    'libra', 'scorpio', 'sagittarius', 'capricorn', 'aquarius', 'pisces',
+)
+SIGN_CHOICES = [(sign, sign.capitalize()) for sign in SIGNS]
 
-# TODO: set up default horoscope for "deleted"
-def get_default_horoscope():
-    return Horoscope.objects.get_or_create(
-        poster=get_sentinel_user(),
-        horoscope="<deleted>",
-    )[0]
+# id of the "<deleted>" placeholder horoscope, looked up once per process
+_default_horoscope_id = None
+
+def get_default_horoscope_id(verify=False):
+    # with verify, a cached id is checked first: another process may have deleted the placeholder
+    global _default_horoscope_id
+    if verify and _default_horoscope_id is not None and not Horoscope.objects.filter(id=_default_horoscope_id).exists():
+        _default_horoscope_id = None
+    if _default_horoscope_id is None:
+        _default_horoscope_id = Horoscope.objects.get_or_create(
+            poster=get_sentinel_user(),
+            horoscope="<deleted>",
+        )[0].id
+    return _default_horoscope_id
+
+def clear_default_horoscope_id():
+    global _default_horoscope_id
+    _default_horoscope_id = None
+
+def get_default_horoscope(collector, field, sub_objs, using):
+    # on_delete handler: points the column at the "<deleted>" placeholder. sub_objs stays a
+    # queryset, so each column is rewritten with one UPDATE however many rows are affected.
+    # The placeholder is checked once per delete, not once per column
+    if not hasattr(collector, 'default_horoscope_id'):
+        collector.default_horoscope_id = get_default_horoscope_id(verify=True)
+    collector.add_field_update(field, collector.default_horoscope_id, sub_objs)
+get_default_horoscope.lazy_sub_objs = True
+
+class HoroscopeQuerySet(models.QuerySet):
+    def newest_first(self, after=None):
+        # keyset pagination: continues strictly after the (date_updated, id) of the last page
+        horoscopes = self.order_by('-date_updated', '-id')
+        if after is not None:
+            date_updated, hid = after
+            horoscopes = horoscopes.filter(
+                models.Q(date_updated__lt=date_updated) | models.Q(date_updated=date_updated, id__lt=hid)
+            )
+        return horoscopes
 
 # Create your models here.
 class Horoscope(models.Model):
+    objects = HoroscopeQuerySet.as_manager()
+
     poster = models.ForeignKey(
         CustomUser,
         on_delete=models.CASCADE,
@@ -22,6 +63,12 @@ class Horoscope(models.Model):
     date_posted = models.DateTimeField(auto_now_add=True)
     date_updated = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # serves UserHoroscopeView pages as an index range scan
+            models.Index(fields=['poster', 'date_updated', 'id'], name='horoscope_poster_updated_idx'),
+        ]
+
     def serialize(self):
         return {
             "id": self.id,
@@ -31,8 +78,20 @@ class Horoscope(models.Model):
             "last_updated": self.date_updated.strftime(DATETIME_FORMAT)
         }
 
+class DailyHoroscopeQuerySet(models.QuerySet):
+    def with_horoscopes(self):
+        # join every sign's horoscope and its poster so serialize() does not
+        # fall back to one lazy query per foreign key
+        return self.select_related(*(f'{sign}__poster' for sign in SIGNS))
+
+    def published(self):
+        # days can be created ahead of time, but are only shown once they have come
+        return self.filter(date__lte=timezone.now().date())
+
 class DailyHoroscope(models.Model):
-    date = models.DateField(auto_now_add=True)
+    objects = DailyHoroscopeQuerySet.as_manager()
+
+    date = models.DateField(default=datetime.date.today, unique=True)
     aries = models.ForeignKey(Horoscope, on_delete=get_default_horoscope, related_name='+')
     taurus = models.ForeignKey(Horoscope, on_delete=get_default_horoscope, related_name='+')
     gemini = models.ForeignKey(Horoscope, on_delete=get_default_horoscope, related_name='+')
@@ -47,28 +106,104 @@ class DailyHoroscope(models.Model):
     pisces = models.ForeignKey(Horoscope, on_delete=get_default_horoscope, related_name='+')
 
     def serialize(self):
-        return {
-            "date": self.date.strftime(DATE_FORMAT),
-            "aries": self.aries.serialize(),
-            "taurus": self.taurus.serialize(),
-            "gemini": self.gemini.serialize(),
-            "cancer": self.cancer.serialize(),
-            "leo": self.leo.serialize(),
-            "virgo": self.virgo.serialize(),
-            "libra": self.libra.serialize(),
-            "scorpio": self.scorpio.serialize(),
-            "sagittarius": self.sagittarius.serialize(),
-            "capricorn": self.capricorn.serialize(),
-            "aquarius": self.aquarius.serialize(),
-            "pisces": self.pisces.serialize(),
-        }
+        ans = {"date": self.date.strftime(DATE_FORMAT)}
+        for sign in SIGNS:
+            ans[sign] = getattr(self, sign).serialize()
+        return ans
+
+    def sync_entries(self):
+        # mirror the twelve sign columns into DailyHoroscopeEntry rows with one upsert
+        DailyHoroscopeEntry.objects.bulk_create(
+            [
+                DailyHoroscopeEntry(date=self.date, sign=sign, horoscope_id=getattr(self, f'{sign}_id'))
+                for sign in SIGNS
+            ],
+            update_conflicts=True,
+            unique_fields=['date', 'sign'],
+            update_fields=['horoscope'],
+        )
+
+class DailyHoroscopeEntryQuerySet(models.QuerySet):
+    def with_horoscopes(self):
+        return self.select_related('horoscope__poster')
+
+    def published(self):
+        # days can be created ahead of time, but are only shown once they have come
+        return self.filter(date__lte=timezone.now().date())
+
+    def latest_day(self):
+        # every entry of the most recent published day, still a single query
+        latest = DailyHoroscopeEntry.objects.published().order_by('-date').values('date')[:1]
+        return self.filter(date=models.Subquery(latest))
+
+    def day(self, date=None, sign=None):
+        # one range scan over the (date, sign) index for the whole day, the latest if date is None
+        entries = self.with_horoscopes()
+        entries = entries.latest_day() if date is None else entries.filter(date=date)
+        return entries if sign is None else entries.filter(sign=sign)
+
+    def date_range(self, start, end, sign=None):
+        # one index range scan, no matter how many days are in the range
+        entries = self.with_horoscopes().published().filter(date__range=(start, end)).order_by('date')
+        return entries if sign is None else entries.filter(sign=sign)
+
+# one row per (date, sign), kept in step with DailyHoroscope by sync_entries()
+class DailyHoroscopeEntry(models.Model):
+    objects = DailyHoroscopeEntryQuerySet.as_manager()
+
+    date = models.DateField()
+    sign = models.CharField(max_length=11, choices=SIGN_CHOICES)
+    horoscope = models.ForeignKey(Horoscope, on_delete=get_default_horoscope, related_name='+')
+
+    class Meta:
+        constraints = [
+            # also the index for reading a whole day
+            models.UniqueConstraint(fields=['date', 'sign'], name='daily_entry_date_sign_unique'),
+        ]
+        indexes = [
+            # one sign across many days
+            models.Index(fields=['sign', 'date'], name='daily_entry_sign_date_idx'),
+        ]
+
+    @staticmethod
+    def serialize_day(date, entries):
+        # same shape as DailyHoroscope.serialize(), with only the entries' signs
+        horoscopes = {entry.sign: entry.horoscope for entry in entries}
+        ans = {"date": date.strftime(DATE_FORMAT)}
+        for sign in SIGNS:
+            if sign in horoscopes:
+                ans[sign] = horoscopes[sign].serialize()
+        return ans
+
+# fully rendered payload of a past day, so historical reads are a single row lookup
+class DailyHoroscopeSnapshot(models.Model):
+    date = models.DateField(unique=True)
+    payload = models.TextField()
+    date_frozen = models.DateTimeField(auto_now_add=True)
+
+class ReportHoroscopeQuerySet(models.QuerySet):
+    def unreviewed(self):
+        # the moderation queue, oldest first, read from the partial index
+        return self.filter(reviewed=False).order_by('date_reported')
 
 class ReportHoroscope(models.Model):
+    objects = ReportHoroscopeQuerySet.as_manager()
+
     date_reported = models.DateTimeField(auto_now_add=True)
     reported_horoscope = models.ForeignKey(Horoscope, on_delete=models.CASCADE, related_name='+')
     reason = models.TextField(default="")
     reviewed = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # moderation only ever works through the unreviewed reports
+            models.Index(
+                fields=['date_reported'],
+                condition=models.Q(reviewed=False),
+                name='report_unreviewed_idx',
+            ),
+        ]
+
     def serialize(self):
         return {
             "date_reported": self.date_reported.strftime(DATETIME_FORMAT),
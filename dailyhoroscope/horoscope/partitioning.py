@@ -0,0 +1,153 @@
+import datetime
+from django.db import connection
+from .models import DailyHoroscopeEntry, Horoscope, ReportHoroscope
+
+# opt-in and PostgreSQL only: tables range-partitioned by month on a timestamp column.
+# Horoscope goes first, its incoming foreign keys have to be gone before ReportHoroscope is converted
+PARTITIONED_MODELS = (
+    (Horoscope, 'date_posted'),
+    (ReportHoroscope, 'date_reported'),
+)
+
+def qn(name):
+    return connection.ops.quote_name(name)
+
+def month_start(date):
+    return datetime.date(date.year, date.month, 1)
+
+def next_month(date):
+    return datetime.date(date.year + date.month // 12, date.month % 12 + 1, 1)
+
+def month_range(first, last):
+    # first day of every month from first's month through last's month
+    month = month_start(first)
+    while month <= last:
+        yield month
+        month = next_month(month)
+
+def partition_name(table, month):
+    return f'{table}_p{month:%Y%m}'
+
+def partition_month(table, name):
+    # the month a partition created here covers, None for the default partition or foreign ones
+    prefix = f'{table}_p'
+    if not name.startswith(prefix) or len(name) != len(prefix) + 6 or not name[len(prefix):].isdigit():
+        return None
+    return datetime.date(int(name[-6:-2]), int(name[-2:]), 1)
+
+def bound(month):
+    # timestamptz literal, independent of the session time zone
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+def is_partitioned(cursor, table):
+    cursor.execute('SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)', [table])
+    return cursor.fetchone() is not None
+
+def list_partitions(cursor, table):
+    cursor.execute(
+        'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+        'WHERE i.inhparent = %s::regclass ORDER BY c.relname',
+        [table]
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+def create_partition(cursor, table, column, month):
+    # moves rows the default partition caught for the month into the new partition,
+    # since attaching a range the default already holds rows for would fail
+    name = partition_name(table, month)
+    cursor.execute('SELECT to_regclass(%s)', [name])
+    if cursor.fetchone()[0] is not None:
+        return False
+    lower, upper = bound(month), bound(next_month(month))
+    cursor.execute(f'CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS)')
+    default = f'{table}_default'
+    cursor.execute('SELECT to_regclass(%s)', [default])
+    if cursor.fetchone()[0] is not None:
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {qn(default)} WHERE {qn(column)} >= {lower} AND {qn(column)} < {upper} '
+            f'RETURNING *) INSERT INTO {qn(name)} SELECT * FROM moved'
+        )
+    cursor.execute(f'ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} FOR VALUES FROM ({lower}) TO ({upper})')
+    return True
+
+def convert_table(cursor, model, column, until):
+    # swaps the table for a partitioned copy with the same columns, indexes and data.
+    # Returns the foreign keys from other tables that were dropped: a primary key on a
+    # partitioned table has to include the partition key, so nothing can reference id alone
+    table = model._meta.db_table
+    pk = model._meta.pk.column
+    old = f'{table}_unpartitioned'
+    sequence = f'{table}_{pk}_partitioned_seq'
+
+    cursor.execute(
+        "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'", [table]
+    )
+    pk_constraint = cursor.fetchone()[0]
+    cursor.execute(
+        'SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() '
+        'AND tablename = %s AND indexname <> %s',
+        [table, pk_constraint]
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+        [table]
+    )
+    outgoing = cursor.fetchall()
+    cursor.execute(
+        "SELECT conrelid::regclass::text, conname FROM pg_constraint WHERE confrelid = %s::regclass AND contype = 'f'",
+        [table]
+    )
+    incoming = cursor.fetchall()
+
+    for referencing, name in incoming:
+        cursor.execute(f'ALTER TABLE {qn(referencing)} DROP CONSTRAINT {qn(name)}')
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX {qn(name)}')
+    cursor.execute(f'ALTER TABLE {qn(table)} DROP CONSTRAINT {qn(pk_constraint)}')
+    cursor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(old)}')
+
+    cursor.execute(
+        f'CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS) PARTITION BY RANGE ({qn(column)})'
+    )
+    # the old id sequence belongs to the old table and goes with it
+    cursor.execute(f'CREATE SEQUENCE {qn(sequence)} OWNED BY {qn(table)}.{qn(pk)}')
+    cursor.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN {qn(pk)} SET DEFAULT nextval('{sequence}')")
+    cursor.execute(f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(pk_constraint)} PRIMARY KEY ({qn(pk)}, {qn(column)})')
+    for name, definition in outgoing:
+        cursor.execute(f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}')
+    for _, definition in indexes:
+        cursor.execute(definition)
+
+    cursor.execute(f'SELECT MIN({qn(column)}) FROM {qn(old)}')
+    first = cursor.fetchone()[0]
+    for month in month_range(first.date() if first else until, until):
+        create_partition(cursor, table, column, month)
+    cursor.execute(f'CREATE TABLE {qn(table + "_default")} PARTITION OF {qn(table)} DEFAULT')
+
+    cursor.execute(f'INSERT INTO {qn(table)} SELECT * FROM {qn(old)}')
+    cursor.execute(
+        f'SELECT setval(%s, COALESCE(MAX({qn(pk)}), 1), MAX({qn(pk)}) IS NOT NULL) FROM {qn(table)}', [sequence]
+    )
+    cursor.execute(f'DROP TABLE {qn(old)}')
+    return incoming
+
+def partition_in_use(model, month):
+    # a Horoscope partition cannot go while a daily horoscope or a report still points into it
+    if model is not Horoscope:
+        return False
+    lower = datetime.datetime.combine(month, datetime.time.min, tzinfo=datetime.timezone.utc)
+    upper = datetime.datetime.combine(next_month(month), datetime.time.min, tzinfo=datetime.timezone.utc)
+    return (
+        DailyHoroscopeEntry.objects.filter(
+            horoscope__date_posted__gte=lower, horoscope__date_posted__lt=upper
+        ).exists()
+        or ReportHoroscope.objects.filter(
+            reported_horoscope__date_posted__gte=lower, reported_horoscope__date_posted__lt=upper
+        ).exists()
+    )
+
+def detach_partition(cursor, table, name, drop=False):
+    cursor.execute(f'ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}')
+    if drop:
+        cursor.execute(f'DROP TABLE {qn(name)}')
@@ -0,0 +1,88 @@
+import datetime
+import time
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from authenticate.models import get_sentinel_user
+from .cache import invalidate_daily
+from .models import SIGNS, DailyHoroscope, DailyHoroscopeEntry, Horoscope, ReportHoroscope
+
+def purge(queryset, delete, batch_size=1000, sleep=0.1, keep=None, progress=None):
+    # walks the queryset's ids in ascending batches, each deleted in its own short transaction,
+    # so no lock is held for long and nothing is collected for more than one batch at a time
+    deleted = 0
+    last_id = 0
+    start = time.monotonic()
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            last_id = ids[-1]
+            if keep is not None:
+                kept = keep(ids)
+                ids = [pk for pk in ids if pk not in kept]
+            if ids:
+                deleted += delete(ids)
+        if progress is not None:
+            progress(deleted, time.monotonic() - start)
+        if sleep:
+            time.sleep(sleep)
+    return deleted
+
+def referenced_horoscope_ids(ids):
+    # horoscopes in a daily horoscope's sign columns or its entries, every column is indexed
+    query = Q()
+    for sign in SIGNS:
+        query |= Q(**{f'{sign}_id__in': ids})
+    referenced = set()
+    for row in DailyHoroscope.objects.filter(query).values_list(*(f'{sign}_id' for sign in SIGNS)):
+        referenced.update(row)
+    referenced.update(DailyHoroscopeEntry.objects.filter(horoscope_id__in=ids).values_list('horoscope_id', flat=True))
+    return referenced
+
+def delete_reports(ids):
+    return ReportHoroscope.objects.filter(id__in=ids).delete()[0]
+
+def delete_horoscopes(ids):
+    # their reports are the only cascade left once referenced horoscopes are skipped, so the
+    # horoscopes go in one DELETE rather than through the collector and per-row delete signals
+    ReportHoroscope.objects.filter(reported_horoscope_id__in=ids).delete()
+    return Horoscope.objects.filter(id__in=ids)._raw_delete(Horoscope.objects.db)
+
+def purge_reports(days, **kwargs):
+    # reviewed reports older than days, unreviewed ones wait for moderation however old
+    cutoff = timezone.now() - datetime.timedelta(days=days)
+    reports = ReportHoroscope.objects.filter(reviewed=True, date_reported__lt=cutoff)
+    return purge(reports, delete_reports, **kwargs)
+
+def purge_horoscopes(days, all_posters=False, **kwargs):
+    # horoscopes posted more than days ago by deleted accounts, or by anyone with all_posters,
+    # except the ones a daily horoscope uses and the "<deleted>" placeholder itself, which
+    # deleted days are pointed at later
+    cutoff = timezone.now() - datetime.timedelta(days=days)
+    sentinel = get_sentinel_user()
+    horoscopes = Horoscope.objects.filter(date_posted__lt=cutoff).exclude(poster=sentinel, horoscope="<deleted>")
+    if not all_posters:
+        horoscopes = horoscopes.filter(poster=sentinel)
+    return purge(horoscopes, delete_horoscopes, keep=referenced_horoscope_ids, **kwargs)
+
+def purge_user_horoscopes(user, **kwargs):
+    # deletes a user's horoscopes in batches, handing the ones a daily horoscope uses to the
+    # deleted-content placeholder instead. Returns (deleted, reassigned)
+    sentinel = get_sentinel_user()
+    reassigned = 0
+
+    def delete(ids):
+        nonlocal reassigned
+        referenced = referenced_horoscope_ids(ids)
+        if referenced:
+            reassigned += Horoscope.objects.filter(id__in=referenced).update(poster=sentinel)
+            # cached dailies carry the poster's username
+            dates = set(DailyHoroscopeEntry.objects.filter(horoscope_id__in=referenced).values_list('date', flat=True))
+            transaction.on_commit(lambda: invalidate_daily(dates))
+        remaining = [pk for pk in ids if pk not in referenced]
+        return delete_horoscopes(remaining) if remaining else 0
+
+    deleted = purge(Horoscope.objects.filter(poster=user), delete, **kwargs)
+    return deleted, reassigned
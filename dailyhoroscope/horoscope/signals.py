@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from .cache import invalidate_daily
+from .models import DailyHoroscope, DailyHoroscopeEntry, Horoscope, clear_default_horoscope_id
+
+@receiver(pre_save, sender=DailyHoroscope)
+def pre_save_invalidate_daily(sender, instance, **kwargs):
+    # the date may be about to change, so drop the payload and entries under the stored date too
+    if instance.pk is None:
+        return
+    stored = DailyHoroscope.objects.filter(pk=instance.pk).values_list('date', flat=True).first()
+    if stored is not None and stored != instance.date:
+        DailyHoroscopeEntry.objects.filter(date=stored).delete()
+        invalidate_daily([stored])
+
+@receiver(post_save, sender=DailyHoroscope)
+def post_save_sync_daily(sender, instance, **kwargs):
+    instance.sync_entries()
+    invalidate_daily([instance.date])
+
+@receiver(post_delete, sender=DailyHoroscope)
+def post_delete_sync_daily(sender, instance, **kwargs):
+    DailyHoroscopeEntry.objects.filter(date=instance.date).delete()
+    invalidate_daily([instance.date])
+
+@receiver(post_save, sender=Horoscope)
+@receiver(pre_delete, sender=Horoscope)
+def invalidate_daily_using_horoscope(sender, instance, created=False, **kwargs):
+    # pre_delete: the entries still point at the horoscope at this point
+    if created:
+        return
+    invalidate_daily(
+        DailyHoroscopeEntry.objects.filter(horoscope=instance).values_list('date', flat=True).distinct()
+    )
+
+@receiver(post_delete, sender=Horoscope)
+def post_delete_clear_default_horoscope(sender, instance, **kwargs):
+    # the placeholder is recreated on the next delete instead of pointing at a missing row
+    if instance.horoscope == "<deleted>":
+        clear_default_horoscope_id()
@@ -0,0 +1,32 @@
+import itertools
+import json
+from rest_framework.renderers import JSONRenderer
+from .models import DailyHoroscopeEntry, DailyHoroscopeSnapshot
+
+def freeze_days(dates):
+    # renders the given days from one query for their entries, and stores them with one upsert
+    entries = DailyHoroscopeEntry.objects.with_horoscopes().filter(date__in=dates).order_by('date')
+    snapshots = [
+        DailyHoroscopeSnapshot(
+            date=date,
+            payload=JSONRenderer().render(DailyHoroscopeEntry.serialize_day(date, day)).decode('utf-8'),
+        )
+        for date, day in itertools.groupby(entries, key=lambda entry: entry.date)
+    ]
+    DailyHoroscopeSnapshot.objects.bulk_create(
+        snapshots,
+        update_conflicts=True,
+        unique_fields=['date'],
+        update_fields=['payload', 'date_frozen'],
+    )
+    return len(snapshots)
+
+def read_snapshot(date, sign=None):
+    # rendered JSON of the frozen day (or one of its signs), None if it was never frozen
+    payload = DailyHoroscopeSnapshot.objects.filter(date=date).values_list('payload', flat=True).first()
+    if payload is None:
+        return None
+    if sign is None:
+        return payload.encode('utf-8')
+    day = json.loads(payload)
+    return JSONRenderer().render({'date': day['date'], sign: day[sign]})
@@ -1,6 +1,37 @@
 import datetime
+import re
 import pytest
-from horoscope.models import Horoscope, DailyHoroscope, ReportHoroscope
+from django.core.cache import cache
+from django.db import connection
+from horoscope.models import Horoscope, DailyHoroscope, ReportHoroscope, clear_default_horoscope_id
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    clear_default_horoscope_id()
+    yield
+    cache.clear()
+    clear_default_horoscope_id()
+
+@pytest.fixture
+def assert_index_scan(db):
+    # EXPLAINs the queryset and fails if its model's table is read with a sequential scan
+    def check(queryset):
+        table = queryset.model._meta.db_table
+        if connection.vendor == 'postgresql':
+            # test tables are tiny, so the planner would otherwise always prefer a seq scan
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = queryset.explain()
+            assert not re.search(rf'Seq Scan on {table}\b', plan), plan
+            assert 'Index' in plan, plan
+        else:
+            plan = queryset.explain()
+            accesses = re.findall(rf'(?:SCAN|SEARCH) {table}\b.*', plan)
+            assert accesses, plan
+            assert all('USING' in access for access in accesses), plan
+        return plan
+    return check
 
 @pytest.fixture
 def user1(db, django_user_model):
@@ -82,10 +113,9 @@ def dailyhoroscope2(horoscope1, horoscope2, horoscope3):
         sagittarius=horoscope2,
         capricorn=horoscope3,
         aquarius=horoscope3,
-        pisces=horoscope2
+        pisces=horoscope2,
+        date=datetime.date(2021, 10, 20)
     )
-    horoscopes.date = datetime.date(2021, 10, 20)
-    horoscopes.save()
     yield horoscopes
 
 @pytest.fixture
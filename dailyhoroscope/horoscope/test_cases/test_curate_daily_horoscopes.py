@@ -0,0 +1,67 @@
+import datetime
+import random
+import pytest
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from authenticate.models import get_sentinel_user
+from horoscope.curation import curate_days, sample_eligible_ids, scan_eligible_ids
+from horoscope.models import SIGNS, DailyHoroscope, DailyHoroscopeEntry, Horoscope, ReportHoroscope
+
+@pytest.fixture
+def many_horoscopes(user1):
+    yield Horoscope.objects.bulk_create([
+        Horoscope(poster=user1, horoscope=f'Horoscope number {i}.') for i in range(60)
+    ])
+
+def test_sample_eligible_ids(many_horoscopes):
+    reported = many_horoscopes[0]
+    ReportHoroscope.objects.create(reported_horoscope=reported, reason='Spam')
+    ids = sample_eligible_ids(59, rng=random.Random(1))
+    assert len(ids) == len(set(ids)) == 59
+    assert reported.id not in ids
+
+def test_sample_eligible_ids_skips_inactive_posters(many_horoscopes, user1):
+    user1.is_active = False
+    user1.save()
+    assert sample_eligible_ids(12) == []
+
+def test_scan_eligible_ids_wraps_around(many_horoscopes):
+    ids = [h.id for h in many_horoscopes]
+    found = scan_eligible_ids(5, {ids[-2]}, ids[-3], get_sentinel_user())
+    assert found == [ids[-3], ids[-1], ids[0], ids[1], ids[2]]
+
+def test_curate_days_resolves_sentinel_once(many_horoscopes):
+    with mock.patch('horoscope.curation.get_sentinel_user', wraps=get_sentinel_user) as sentinel:
+        curate_days(datetime.date(2030, 1, 1), 5, rng=random.Random(4))
+    sentinel.assert_called_once()
+
+def test_curate_days_skips_recently_used(many_horoscopes):
+    start = datetime.date(2030, 1, 1)
+    used = many_horoscopes[:12]
+    DailyHoroscope.objects.create(date=start - datetime.timedelta(days=1), **dict(zip(SIGNS, used)))
+    schedule = curate_days(start, 4, rng=random.Random(2))
+    picked = [hid for day in schedule for hid in day.values()]
+    assert len(picked) == len(set(picked)) == 48
+    assert not set(picked) & {h.id for h in used}
+
+def test_curate_days_not_enough_horoscopes(horoscope1, horoscope2, horoscope3):
+    with pytest.raises(ValueError):
+        curate_days(datetime.date(2030, 1, 1), 1)
+
+def test_curate_daily_horoscopes(many_horoscopes, django_assert_max_num_queries):
+    start = datetime.date(2030, 1, 1)
+    DailyHoroscope.objects.create(date=start + datetime.timedelta(days=1), **dict(zip(SIGNS, many_horoscopes)))
+    # a bounded number of queries however many days are curated
+    with django_assert_max_num_queries(30):
+        call_command('curate_daily_horoscopes', f'--start={start.isoformat()}', '--days=10', '--seed=3')
+
+    assert DailyHoroscope.objects.filter(date__gte=start).count() == 10
+    assert DailyHoroscopeEntry.objects.filter(date__gte=start).count() == 10 * len(SIGNS)
+    for daily in DailyHoroscope.objects.filter(date__gte=start):
+        picks = [getattr(daily, f'{sign}_id') for sign in SIGNS]
+        assert len(set(picks)) == len(SIGNS)
+
+def test_curate_daily_horoscopes_invalid_days(db):
+    with pytest.raises(CommandError):
+        call_command('curate_daily_horoscopes', '--days=0')
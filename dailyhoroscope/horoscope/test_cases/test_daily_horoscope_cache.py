@@ -0,0 +1,66 @@
+import datetime
+import threading
+import time
+import pytest
+from unittest import mock
+from django.core.cache import cache
+from horoscope.cache import REBUILD_LOCK_STRIPES, daily_cache_key, get_daily_payload, get_rebuild_lock, invalidate_daily
+from horoscope.models import DailyHoroscopeEntry
+
+def test_stale_served_while_rebuilding(dailyhoroscope, django_assert_num_queries):
+    payload = get_daily_payload()
+    invalidate_daily([dailyhoroscope.date])
+
+    # someone else holds the rebuild lock, so the stale payload is served without touching the database
+    cache.add(f'{daily_cache_key(dailyhoroscope.date)}:lock', True)
+    with django_assert_num_queries(0):
+        assert get_daily_payload() == payload
+
+def test_stale_rebuilt_by_one_request(dailyhoroscope, horoscope1):
+    get_daily_payload()
+    horoscope1.horoscope = 'Life can get hard, but at least you have legs.'
+    horoscope1.save()
+
+    payload = get_daily_payload()
+    assert b'at least you have legs' in payload['body']
+    assert cache.get(f'{daily_cache_key(horoscope1.date_posted.date())}:lock') is None
+
+def test_miss_rebuilt_once():
+    # concurrent misses in one process wait on a single rebuild
+    calls = []
+    def render_daily(date, sign):
+        calls.append(date)
+        time.sleep(0.2)
+        return b'{}'
+
+    with mock.patch('horoscope.cache.render_daily', side_effect=render_daily):
+        threads = [threading.Thread(target=get_daily_payload) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(calls) == 1
+    assert get_daily_payload()['body'] == b'{}'
+
+def test_stale_served_when_rebuild_fails(dailyhoroscope):
+    payload = get_daily_payload()
+    invalidate_daily([dailyhoroscope.date])
+
+    with mock.patch('horoscope.cache.render_daily', side_effect=RuntimeError('database is down')):
+        assert get_daily_payload() == payload
+    assert cache.get(f'{daily_cache_key(dailyhoroscope.date)}:lock') is None
+
+def test_stale_dropped_when_day_deleted(dailyhoroscope):
+    get_daily_payload(dailyhoroscope.date)
+    dailyhoroscope.delete()
+
+    with pytest.raises(DailyHoroscopeEntry.DoesNotExist):
+        get_daily_payload(dailyhoroscope.date)
+    assert cache.get(daily_cache_key(dailyhoroscope.date)) is None
+
+def test_rebuild_locks_bounded():
+    # request-supplied dates share a fixed set of locks instead of adding one each
+    locks = {id(get_rebuild_lock(daily_cache_key(datetime.date(2000, 1, 1) + datetime.timedelta(days=i))))
+             for i in range(1000)}
+    assert len(locks) <= REBUILD_LOCK_STRIPES
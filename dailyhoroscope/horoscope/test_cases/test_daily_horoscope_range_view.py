@@ -0,0 +1,75 @@
+import datetime
+import json
+import pytest
+from django.urls import reverse
+from horoscope.models import SIGNS, DailyHoroscope, DailyHoroscopeEntry
+
+def test_get(client, dailyhoroscope2, horoscope3, django_assert_num_queries):
+    dailies = [dailyhoroscope2]
+    for day in range(21, 24):
+        daily = DailyHoroscope.objects.create(
+            date=datetime.date(2021, 10, day),
+            **{sign: horoscope3 for sign in SIGNS}
+        )
+        dailies.append(daily)
+
+    with django_assert_num_queries(1):
+        response = client.get(reverse('daily_horoscope_range_view') + '?start=2021-10-01&end=2021-10-31')
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert results == [daily.serialize() for daily in dailies]
+    assert response.has_header('ETag')
+
+def test_get_empty_range(client, dailyhoroscope2):
+    response = client.get(reverse('daily_horoscope_range_view') + '?start=2021-10-21&end=2021-10-31')
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert results == []
+
+def test_get_not_modified(client, dailyhoroscope2):
+    url = reverse('daily_horoscope_range_view') + '?start=2021-10-01&end=2021-10-31'
+    response = client.get(url)
+    etag = response['ETag']
+
+    response = client.get(url, headers={'IF_NONE_MATCH': etag})
+    assert response.status_code == 304
+
+def test_get_incorrect_date_format(client, dailyhoroscope):
+    response = client.get(reverse('daily_horoscope_range_view') + '?start=10/20/2021&end=2021-10-31')
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 400
+    assert results['message'] == 'URL must contain a valid "start" and "end" Date in format "YYYY-MM-DD".'
+
+def test_get_end_before_start(client, dailyhoroscope):
+    response = client.get(reverse('daily_horoscope_range_view') + '?start=2021-10-31&end=2021-10-01')
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 400
+    assert results['message'] == 'The "end" Date must not be before the "start" Date.'
+
+def test_get_range_too_long(client, dailyhoroscope, settings):
+    settings.DAILY_HOROSCOPE_MAX_RANGE_DAYS = 7
+    response = client.get(reverse('daily_horoscope_range_view') + '?start=2021-10-01&end=2021-10-08')
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 400
+    assert results['message'] == 'The date range must not span more than 7 days.'
+
+def test_get_sign(client, dailyhoroscope2):
+    response = client.get(reverse('daily_horoscope_range_view') + '?start=2021-10-01&end=2021-10-31&sign=leo')
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 200
+    entries = DailyHoroscopeEntry.objects.day(dailyhoroscope2.date, 'leo')
+    assert results == [DailyHoroscopeEntry.serialize_day(dailyhoroscope2.date, entries)]
+    assert list(results[0]) == ['date', 'leo']
+
+def test_get_invalid_sign(client, dailyhoroscope2):
+    response = client.get(reverse('daily_horoscope_range_view') + '?start=2021-10-01&end=2021-10-31&sign=ophiuchus')
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 400
+    assert results['message'] == '"ophiuchus" is not a valid sign.'
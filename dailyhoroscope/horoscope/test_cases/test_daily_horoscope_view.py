@@ -1,7 +1,10 @@
+import gzip
 import json
 import pytest
+from django.core.management import call_command
 from django.urls import reverse
 from django.utils import timezone
+from horoscope.models import SIGNS, DailyHoroscope, DailyHoroscopeEntry, DailyHoroscopeSnapshot
 
 def test_get(client, dailyhoroscope):
     response = client.get(reverse('daily_horoscope_view'))
@@ -33,4 +36,112 @@ def test_get_date_not_exists(client, dailyhoroscope):
     date = '2023-10-31'
 
     response = client.get(reverse('daily_horoscope_view') + f'?date={date}')
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+def test_get_query_count(client, dailyhoroscope, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        response = client.get(reverse('daily_horoscope_view'))
+    assert response.status_code == 200
+
+def test_get_specific_date_query_count(client, dailyhoroscope, dailyhoroscope2, django_assert_num_queries):
+    # past day without a snapshot: snapshot lookup, then the day's entries
+    date = dailyhoroscope2.date
+    with django_assert_num_queries(2):
+        response = client.get(reverse('daily_horoscope_view') + f'?date={date.isoformat()}')
+    assert response.status_code == 200
+
+def test_get_frozen(client, dailyhoroscope2, django_assert_num_queries):
+    call_command('freeze_daily_horoscopes')
+    expected = dailyhoroscope2.serialize()
+
+    # the snapshot alone answers, even with the day's entries gone
+    DailyHoroscopeEntry.objects.filter(date=dailyhoroscope2.date).delete()
+    with django_assert_num_queries(1):
+        response = client.get(reverse('daily_horoscope_view') + f'?date={dailyhoroscope2.date.isoformat()}')
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert results == expected
+
+    response = client.get(reverse('daily_sign_horoscope_view', kwargs={'sign': 'leo'}) + f'?date={dailyhoroscope2.date.isoformat()}')
+    results = json.loads(response.content.decode('utf-8'))
+    assert results == dailyhoroscope2.serialize_sign('leo')
+
+def test_get_frozen_dropped_on_horoscope_edit(client, dailyhoroscope2, horoscope1):
+    call_command('freeze_daily_horoscopes')
+
+    horoscope1.horoscope = 'Life can get hard, but at least you have legs.'
+    horoscope1.save()
+
+    assert not DailyHoroscopeSnapshot.objects.exists()
+    response = client.get(reverse('daily_horoscope_view') + f'?date={dailyhoroscope2.date.isoformat()}')
+    results = json.loads(response.content.decode('utf-8'))
+    assert results['aries']['horoscope'] == horoscope1.horoscope
+
+def test_get_cached(client, dailyhoroscope, django_assert_num_queries):
+    response = client.get(reverse('daily_horoscope_view'))
+    assert response.status_code == 200
+
+    with django_assert_num_queries(0):
+        cached = client.get(reverse('daily_horoscope_view'))
+    assert cached.status_code == 200
+    assert cached.content == response.content
+
+def test_get_cached_without_today(client, dailyhoroscope2, django_assert_num_queries):
+    # no daily for today: the latest published day is served, and today is not looked up again
+    response = client.get(reverse('daily_horoscope_view'))
+    assert json.loads(response.content.decode('utf-8')) == dailyhoroscope2.serialize()
+
+    with django_assert_num_queries(0):
+        cached = client.get(reverse('daily_horoscope_view'))
+    assert cached.content == response.content
+
+def test_get_today_published_after_miss(client, dailyhoroscope2, horoscope1, horoscope2, horoscope3):
+    client.get(reverse('daily_horoscope_view'))
+    today = DailyHoroscope.objects.create(**{
+        sign: getattr(dailyhoroscope2, sign) for sign in SIGNS
+    })
+
+    response = client.get(reverse('daily_horoscope_view'))
+    assert json.loads(response.content.decode('utf-8')) == today.serialize()
+
+def test_get_cache_invalidated_on_horoscope_edit(client, dailyhoroscope, horoscope1):
+    client.get(reverse('daily_horoscope_view'))
+
+    horoscope1.horoscope = 'Life can get hard, but at least you have legs.'
+    horoscope1.save()
+
+    response = client.get(reverse('daily_horoscope_view'))
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert results['aries']['horoscope'] == horoscope1.horoscope
+
+def test_get_cache_invalidated_on_daily_change(client, dailyhoroscope, horoscope3):
+    client.get(reverse('daily_horoscope_view'))
+
+    dailyhoroscope.aries = horoscope3
+    dailyhoroscope.save()
+
+    response = client.get(reverse('daily_horoscope_view'))
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert results['aries'] == horoscope3.serialize()
+
+def test_get_not_modified(client, dailyhoroscope, django_assert_num_queries):
+    response = client.get(reverse('daily_horoscope_view'))
+    assert response.has_header('Last-Modified')
+    assert 'max-age' in response['Cache-Control']
+
+    with django_assert_num_queries(0):
+        response = client.get(reverse('daily_horoscope_view'), headers={'IF_NONE_MATCH': response['ETag']})
+    assert response.status_code == 304
+
+def test_get_gzip(client, dailyhoroscope):
+    response = client.get(reverse('daily_horoscope_view'), headers={'ACCEPT_ENCODING': 'gzip, deflate'})
+
+    assert response.status_code == 200
+    assert response['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response['Vary']
+    assert json.loads(gzip.decompress(response.content)) == dailyhoroscope.serialize()
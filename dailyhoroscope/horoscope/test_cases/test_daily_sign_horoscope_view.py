@@ -0,0 +1,49 @@
+import json
+import pytest
+from django.urls import reverse
+
+def test_get(client, dailyhoroscope, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        response = client.get(reverse('daily_sign_horoscope_view', kwargs={'sign': 'leo'}))
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert results == {
+        'date': dailyhoroscope.serialize()['date'],
+        'leo': dailyhoroscope.leo.serialize(),
+    }
+
+def test_get_specific_date(client, dailyhoroscope, dailyhoroscope2):
+    date = dailyhoroscope2.date
+
+    response = client.get(
+        reverse('daily_sign_horoscope_view', kwargs={'sign': 'pisces'}) + f'?date={date.isoformat()}'
+    )
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert results['pisces'] == dailyhoroscope2.pisces.serialize()
+
+def test_get_cache_invalidated_on_horoscope_edit(client, dailyhoroscope, horoscope3):
+    client.get(reverse('daily_sign_horoscope_view', kwargs={'sign': 'leo'}))
+
+    horoscope3.horoscope = 'Wahoo!'
+    horoscope3.save()
+
+    response = client.get(reverse('daily_sign_horoscope_view', kwargs={'sign': 'leo'}))
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert results['leo']['horoscope'] == 'Wahoo!'
+
+def test_get_invalid_sign(client, dailyhoroscope):
+    response = client.get(reverse('daily_sign_horoscope_view', kwargs={'sign': 'ophiuchus'}))
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 404
+    assert results['message'] == '"ophiuchus" is not a valid sign.'
+
+def test_get_date_not_exists(client, dailyhoroscope):
+    response = client.get(
+        reverse('daily_sign_horoscope_view', kwargs={'sign': 'leo'}) + '?date=2023-10-31'
+    )
+    assert response.status_code == 404
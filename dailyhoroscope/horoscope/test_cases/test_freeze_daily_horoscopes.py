@@ -0,0 +1,22 @@
+import json
+import pytest
+from django.core.management import call_command
+from horoscope.models import DailyHoroscopeSnapshot
+
+def test_freeze_daily_horoscopes(dailyhoroscope, dailyhoroscope2):
+    call_command('freeze_daily_horoscopes')
+
+    # only past days are frozen
+    snapshot = DailyHoroscopeSnapshot.objects.get()
+    assert snapshot.date == dailyhoroscope2.date
+    assert json.loads(snapshot.payload) == dailyhoroscope2.serialize()
+
+def test_freeze_daily_horoscopes_skips_frozen(dailyhoroscope2):
+    call_command('freeze_daily_horoscopes')
+    DailyHoroscopeSnapshot.objects.update(payload='{}')
+
+    call_command('freeze_daily_horoscopes')
+    assert DailyHoroscopeSnapshot.objects.get().payload == '{}'
+
+    call_command('freeze_daily_horoscopes', '--refresh')
+    assert json.loads(DailyHoroscopeSnapshot.objects.get().payload) == dailyhoroscope2.serialize()
@@ -0,0 +1,100 @@
+import csv
+import datetime
+import io
+import json
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from horoscope.models import Horoscope
+
+@pytest.fixture
+def admin_token(client, django_user_model):
+    django_user_model.objects.create_superuser(
+        email='admin@horoscope.com',
+        username='Admin',
+        password='Password123!',
+    )
+    response = client.post(
+        reverse('login_view'),
+        data={'username': 'admin@horoscope.com', 'password': 'Password123!'}
+    )
+    yield json.loads(response.content.decode('utf-8'))['data']['access']
+
+def read_stream(response):
+    return b''.join(response.streaming_content).decode('utf-8')
+
+def test_export_ndjson(client, admin_token, horoscope1, horoscope2, horoscope3):
+    response = client.get(reverse('horoscope_export_view'), headers={'AUTHORIZATION': f'Bearer {admin_token}'})
+    assert response.status_code == 200
+    assert response.streaming
+    assert response['Content-Type'] == 'application/x-ndjson'
+
+    rows = [json.loads(line) for line in read_stream(response).splitlines()]
+    assert [row['id'] for row in rows] == [horoscope1.id, horoscope2.id, horoscope3.id]
+    assert rows[2]['username'] == horoscope3.poster.username
+    assert rows[2]['horoscope'] == horoscope3.horoscope
+    assert rows[2]['date_posted'] == horoscope3.date_posted.isoformat()
+
+def test_export_csv(client, admin_token, horoscope1, horoscope2):
+    response = client.get(
+        reverse('horoscope_export_view') + '?output=csv',
+        headers={'AUTHORIZATION': f'Bearer {admin_token}'}
+    )
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/csv'
+
+    rows = list(csv.reader(io.StringIO(read_stream(response))))
+    assert rows[0] == ['id', 'username', 'horoscope', 'date_posted', 'date_updated']
+    assert [row[2] for row in rows[1:]] == [horoscope1.horoscope, horoscope2.horoscope]
+
+def test_export_date_filters(client, admin_token, horoscope1, horoscope2):
+    Horoscope.objects.filter(id=horoscope1.id).update(
+        date_posted=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    )
+    response = client.get(
+        reverse('horoscope_export_view') + '?posted_after=2020-01-02',
+        headers={'AUTHORIZATION': f'Bearer {admin_token}'}
+    )
+    rows = [json.loads(line) for line in read_stream(response).splitlines()]
+    assert [row['id'] for row in rows] == [horoscope2.id]
+
+    response = client.get(
+        reverse('horoscope_export_view') + '?posted_before=2020-01-02',
+        headers={'AUTHORIZATION': f'Bearer {admin_token}'}
+    )
+    rows = [json.loads(line) for line in read_stream(response).splitlines()]
+    assert [row['id'] for row in rows] == [horoscope1.id]
+
+@pytest.mark.parametrize('query', ['?output=xml', '?posted_after=yesterday'])
+def test_export_invalid(client, admin_token, query):
+    response = client.get(
+        reverse('horoscope_export_view') + query,
+        headers={'AUTHORIZATION': f'Bearer {admin_token}'}
+    )
+    assert response.status_code == 400
+
+def test_export_not_admin(client, user1):
+    response = client.post(
+        reverse('login_view'),
+        data={'username': 'papermario@ttyd.com', 'password': 'Password123!'}
+    )
+    token = json.loads(response.content.decode('utf-8'))['data']['access']
+    response = client.get(reverse('horoscope_export_view'), headers={'AUTHORIZATION': f'Bearer {token}'})
+    assert response.status_code == 403
+
+    response = client.get(reverse('horoscope_export_view'))
+    assert response.status_code == 401
+
+def test_export_horoscopes_command(horoscope1, horoscope2, tmp_path):
+    out = io.StringIO()
+    call_command('export_horoscopes', stdout=out)
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [row['id'] for row in rows] == [horoscope1.id, horoscope2.id]
+
+    path = tmp_path / 'horoscopes.csv'
+    out = io.StringIO()
+    call_command('export_horoscopes', '--output=csv', f'--file={path}', stdout=out)
+    assert 'Exported 2 horoscope(s)' in out.getvalue()
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert len(rows) == 3
@@ -0,0 +1,31 @@
+import datetime
+from horoscope.models import DailyHoroscopeEntry, ReportHoroscope
+
+# each test EXPLAINs the queryset method the view itself runs, so a change to the view's
+# filters or ordering is checked against the indexes too
+
+def test_daily_horoscope_entries_by_date(assert_index_scan, dailyhoroscope):
+    assert_index_scan(DailyHoroscopeEntry.objects.day(dailyhoroscope.date))
+
+def test_daily_horoscope_entries_by_date_and_sign(assert_index_scan, dailyhoroscope):
+    assert_index_scan(DailyHoroscopeEntry.objects.day(dailyhoroscope.date, 'leo'))
+
+def test_daily_horoscope_entries_latest_day(assert_index_scan, dailyhoroscope):
+    assert_index_scan(DailyHoroscopeEntry.objects.day())
+
+def test_daily_horoscope_entries_range(assert_index_scan, dailyhoroscope2):
+    assert_index_scan(DailyHoroscopeEntry.objects.date_range(datetime.date(2021, 10, 1), datetime.date(2021, 10, 31)))
+
+def test_daily_horoscope_entries_by_sign(assert_index_scan, dailyhoroscope2):
+    assert_index_scan(DailyHoroscopeEntry.objects.date_range(
+        datetime.date(2021, 10, 1), datetime.date(2021, 10, 31), 'leo'
+    ))
+
+def test_user_horoscopes(assert_index_scan, user1, horoscope1):
+    assert_index_scan(user1.horoscopes_written.newest_first()[:21])
+
+def test_user_horoscopes_next_page(assert_index_scan, user1, horoscope1):
+    assert_index_scan(user1.horoscopes_written.newest_first((horoscope1.date_updated, horoscope1.id))[:21])
+
+def test_unreviewed_reports(assert_index_scan, reporthoroscope):
+    assert_index_scan(ReportHoroscope.objects.unreviewed())
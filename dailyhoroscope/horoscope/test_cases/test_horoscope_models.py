@@ -1,4 +1,6 @@
-from horoscope.models import DATE_FORMAT, DATETIME_FORMAT
+import datetime
+from authenticate.models import get_sentinel_user
+from horoscope.models import DATE_FORMAT, DATETIME_FORMAT, SIGNS, DailyHoroscopeEntry, Horoscope, get_default_horoscope_id
 
 def test_horoscope_serialize(horoscope1):
     result = horoscope1.serialize()
@@ -30,4 +32,56 @@ def test_report_horoscope_serialize(reporthoroscope):
     assert result['date_reported'] == reporthoroscope.date_reported.strftime(DATETIME_FORMAT)
     assert result['horoscope'] == reporthoroscope.reported_horoscope.serialize()
     assert result['reason'] == reporthoroscope.reason
-    assert result['reviewed'] == reporthoroscope.reviewed
\ No newline at end of file
+    assert result['reviewed'] == reporthoroscope.reviewed
+
+def test_daily_horoscope_entries_synced(dailyhoroscope):
+    entries = DailyHoroscopeEntry.objects.filter(date=dailyhoroscope.date)
+    assert {entry.sign: entry.horoscope_id for entry in entries} == {
+        sign: getattr(dailyhoroscope, f'{sign}_id') for sign in SIGNS
+    }
+    assert DailyHoroscopeEntry.serialize_day(dailyhoroscope.date, entries) == dailyhoroscope.serialize()
+
+def test_daily_horoscope_entries_follow_changes(dailyhoroscope, horoscope3):
+    old_date = dailyhoroscope.date
+    dailyhoroscope.aries = horoscope3
+    dailyhoroscope.date = datetime.date(2021, 10, 21)
+    dailyhoroscope.save()
+
+    assert not DailyHoroscopeEntry.objects.filter(date=old_date).exists()
+    entry = DailyHoroscopeEntry.objects.get(date=dailyhoroscope.date, sign='aries')
+    assert entry.horoscope_id == horoscope3.id
+
+    dailyhoroscope.delete()
+    assert not DailyHoroscopeEntry.objects.exists()
+
+def test_delete_horoscope_in_daily_horoscope(dailyhoroscope, horoscope1, horoscope2, django_assert_max_num_queries):
+    placeholder = Horoscope.objects.get(id=get_default_horoscope_id())
+    assert placeholder.horoscope == '<deleted>'
+    assert placeholder.poster == get_sentinel_user()
+
+    # one UPDATE per column whatever the number of rows, the placeholder is only checked once
+    with django_assert_max_num_queries(26):
+        Horoscope.objects.filter(id__in=[horoscope1.id, horoscope2.id]).delete()
+
+    dailyhoroscope.refresh_from_db()
+    for sign in SIGNS:
+        assert getattr(dailyhoroscope, f'{sign}_id') in (placeholder.id, dailyhoroscope.leo_id)
+    assert dailyhoroscope.aries_id == placeholder.id
+    assert set(DailyHoroscopeEntry.objects.values_list('horoscope_id', flat=True)) == {
+        placeholder.id, dailyhoroscope.leo_id
+    }
+
+def test_delete_default_horoscope(horoscope1):
+    placeholder_id = get_default_horoscope_id()
+    Horoscope.objects.filter(id=placeholder_id).delete()
+    assert get_default_horoscope_id() != placeholder_id
+
+def test_default_horoscope_deleted_elsewhere(dailyhoroscope, horoscope1):
+    placeholder_id = get_default_horoscope_id()
+    # removed without signals, like another process or a raw delete would
+    Horoscope.objects.filter(id=placeholder_id)._raw_delete(Horoscope.objects.db)
+
+    horoscope1.delete()
+    dailyhoroscope.refresh_from_db()
+    assert dailyhoroscope.aries_id != placeholder_id
+    assert Horoscope.objects.get(id=dailyhoroscope.aries_id).horoscope == '<deleted>'
@@ -78,3 +78,107 @@ def test_post_html_escape(client, user1):
     horoscope = get_object_or_404(Horoscope, id=results['data']['id'])
     assert horoscope is not None
     assert results['data']['horoscope'] == horoscope.horoscope and horoscope.horoscope == '&lt;p&gt;You are never not enough for Jesus.&lt;/p&gt;'
+
+def test_post_many(client, user1, django_assert_max_num_queries):
+    response = client.post(
+        reverse('login_view'),
+        data={'username': 'papermario@ttyd.com', 'password': 'Password123!'}
+    )
+    results = json.loads(response.content.decode('utf-8'))
+    token = results['data']['access']
+
+    data = {
+        'horoscopes': [f'<b>Horoscope number {i}.</b>' for i in range(50)]
+    }
+
+    # one INSERT however many horoscopes are uploaded
+    with django_assert_max_num_queries(5):
+        response = client.post(
+            reverse('horoscope_view'),
+            data=data,
+            content_type='application/json',
+            headers={'AUTHORIZATION': f'Bearer {token}'}
+        )
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 201
+    assert results['message'] == '50 horoscopes have been successfully uploaded.'
+    assert len(results['data']) == 50
+
+    horoscopes = Horoscope.objects.in_bulk(results['data'])
+    assert [horoscopes[hid].horoscope for hid in results['data']] == [
+        f'&lt;b&gt;Horoscope number {i}.&lt;/b&gt;' for i in range(50)
+    ]
+    assert all(horoscope.poster_id == user1.id for horoscope in horoscopes.values())
+
+@pytest.mark.parametrize('horoscopes', [[], 'not a list', ['fine', ''], ['fine', 3]])
+def test_post_many_invalid(client, user1, horoscopes):
+    response = client.post(
+        reverse('login_view'),
+        data={'username': 'papermario@ttyd.com', 'password': 'Password123!'}
+    )
+    results = json.loads(response.content.decode('utf-8'))
+    token = results['data']['access']
+
+    response = client.post(
+        reverse('horoscope_view'),
+        data={'horoscopes': horoscopes},
+        content_type='application/json',
+        headers={'AUTHORIZATION': f'Bearer {token}'}
+    )
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 400
+    assert results['message'] == '"horoscopes" must be a non-empty list of strings.'
+    assert Horoscope.objects.count() == 0
+
+def test_post_many_too_many(client, user1, settings):
+    settings.HOROSCOPE_BULK_CREATE_MAX = 2
+    response = client.post(
+        reverse('login_view'),
+        data={'username': 'papermario@ttyd.com', 'password': 'Password123!'}
+    )
+    results = json.loads(response.content.decode('utf-8'))
+    token = results['data']['access']
+
+    response = client.post(
+        reverse('horoscope_view'),
+        data={'horoscopes': ['one', 'two', 'three']},
+        content_type='application/json',
+        headers={'AUTHORIZATION': f'Bearer {token}'}
+    )
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 400
+    assert results['message'] == 'At most 2 horoscopes can be uploaded at once.'
+    assert Horoscope.objects.count() == 0
+
+def test_get_many(client, horoscope1, horoscope2, horoscope3, django_assert_num_queries):
+    ids = [horoscope3.id, 0, horoscope1.id, horoscope3.id]
+    with django_assert_num_queries(1):
+        response = client.get(reverse('horoscope_view') + f'?ids={",".join(str(hid) for hid in ids)}')
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert results == [horoscope3.serialize(), None, horoscope1.serialize(), horoscope3.serialize()]
+
+@pytest.mark.parametrize('ids', ['', '1,two', '1,,2'])
+def test_get_many_invalid(client, db, ids):
+    response = client.get(reverse('horoscope_view') + f'?ids={ids}')
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 400
+    assert results['message'] == '"ids" must be a comma-separated list of horoscope ids.'
+
+def test_get_many_too_many(client, db, settings):
+    settings.HOROSCOPE_BATCH_GET_MAX = 2
+    response = client.get(reverse('horoscope_view') + '?ids=1,2,3')
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 400
+    assert results['message'] == 'At most 2 horoscopes can be requested at once.'
+
+def test_post_unauthenticated(client, db):
+    response = client.post(reverse('horoscope_view'), data={'horoscope': 'Anonymous.'})
+    assert response.status_code == 401
+    assert Horoscope.objects.count() == 0
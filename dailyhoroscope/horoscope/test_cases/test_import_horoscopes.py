@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+import pytest
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from horoscope.management.commands.import_horoscopes import Command
+from horoscope.models import Horoscope
+
+def write_ndjson(path, rows):
+    path.write_text(''.join(json.dumps(row) + '\n' for row in rows), encoding='utf-8')
+    return path
+
+def test_import_ndjson(user1, user2, tmp_path, django_assert_max_num_queries):
+    path = write_ndjson(tmp_path / 'horoscopes.ndjson', [
+        {'username': user1.username, 'horoscope': f'<i>Horoscope {i}.</i>'} for i in range(25)
+    ] + [{'username': user2.username, 'horoscope': 'Lets-a go.'}])
+
+    out = io.StringIO()
+    # one username lookup and one INSERT per chunk, not one query per row
+    with django_assert_max_num_queries(10):
+        call_command('import_horoscopes', str(path), '--chunk-size=10', stdout=out)
+
+    assert 'Imported 26 horoscope(s)' in out.getvalue()
+    assert 'rows/sec' in out.getvalue()
+    assert Horoscope.objects.filter(poster=user1).count() == 25
+    assert Horoscope.objects.filter(poster=user1, horoscope='&lt;i&gt;Horoscope 0.&lt;/i&gt;').exists()
+    assert Horoscope.objects.get(poster=user2).horoscope == 'Lets-a go.'
+
+def test_import_csv(user1, tmp_path):
+    path = tmp_path / 'horoscopes.csv'
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'username', 'horoscope'])
+        writer.writerow([1, user1.username, 'Commas, "quotes" and\nnewlines.'])
+
+    call_command('import_horoscopes', str(path), stdout=io.StringIO())
+    assert Horoscope.objects.get().horoscope == 'Commas, &quot;quotes&quot; and\nnewlines.'
+
+def test_import_unknown_username(user1, tmp_path):
+    path = write_ndjson(tmp_path / 'horoscopes.ndjson', [
+        {'username': user1.username, 'horoscope': 'Known.'},
+        {'username': 'Bowser', 'horoscope': 'Unknown.'},
+    ])
+    with pytest.raises(CommandError):
+        call_command('import_horoscopes', str(path), stdout=io.StringIO())
+    assert Horoscope.objects.count() == 0
+
+    call_command('import_horoscopes', str(path), '--skip-unknown', stdout=io.StringIO())
+    assert list(Horoscope.objects.values_list('horoscope', flat=True)) == ['Known.']
+
+def test_import_invalid_row(user1, tmp_path):
+    path = write_ndjson(tmp_path / 'horoscopes.ndjson', [{'username': user1.username}])
+    with pytest.raises(CommandError):
+        call_command('import_horoscopes', str(path), stdout=io.StringIO())
+
+def test_import_invalid_json(user1, tmp_path):
+    path = tmp_path / 'horoscopes.ndjson'
+    path.write_text('{"username": "GoombellaGirl", "horoscope": "Fine."}\n{not json\n', encoding='utf-8')
+    with pytest.raises(CommandError) as error:
+        call_command('import_horoscopes', str(path), stdout=io.StringIO())
+    assert 'Line 2' in str(error.value)
+
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason='COPY needs PostgreSQL')
+def test_import_copy(user1, tmp_path):
+    path = write_ndjson(tmp_path / 'horoscopes.ndjson', [
+        {'username': user1.username, 'horoscope': ''},
+        {'username': user1.username, 'horoscope': 'Commas, "quotes" and\nnewlines & <tags>.'},
+    ])
+    with mock.patch.object(Command, 'create_chunk') as create_chunk:
+        call_command('import_horoscopes', str(path), stdout=io.StringIO())
+    create_chunk.assert_not_called()
+
+    assert list(Horoscope.objects.order_by('id').values_list('horoscope', flat=True)) == [
+        '', 'Commas, &quot;quotes&quot; and\nnewlines &amp; &lt;tags&gt;.'
+    ]
+    # the id sequence moved on with the copied rows
+    assert Horoscope.objects.create(poster=user1, horoscope='After.').id > Horoscope.objects.order_by('id')[1].id
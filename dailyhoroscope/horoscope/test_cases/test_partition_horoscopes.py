@@ -0,0 +1,53 @@
+import datetime
+import io
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.urls import reverse
+from horoscope.models import Horoscope, ReportHoroscope
+from horoscope.partitioning import month_range, next_month, partition_month, partition_name
+
+postgresql_only = pytest.mark.skipif(connection.vendor != 'postgresql', reason='partitioning needs PostgreSQL')
+
+def test_month_range():
+    months = list(month_range(datetime.date(2023, 11, 15), datetime.date(2024, 2, 1)))
+    assert months == [
+        datetime.date(2023, 11, 1), datetime.date(2023, 12, 1), datetime.date(2024, 1, 1), datetime.date(2024, 2, 1)
+    ]
+    assert next_month(datetime.date(2023, 12, 1)) == datetime.date(2024, 1, 1)
+
+def test_partition_names():
+    name = partition_name('horoscope_horoscope', datetime.date(2024, 3, 1))
+    assert name == 'horoscope_horoscope_p202403'
+    assert partition_month('horoscope_horoscope', name) == datetime.date(2024, 3, 1)
+    assert partition_month('horoscope_horoscope', 'horoscope_horoscope_default') is None
+
+@pytest.mark.skipif(connection.vendor == 'postgresql', reason='checks the refusal on other backends')
+def test_partition_horoscopes_unsupported(db):
+    with pytest.raises(CommandError):
+        call_command('partition_horoscopes', 'convert')
+
+@postgresql_only
+def test_partition_horoscopes(client, dailyhoroscope, horoscope1):
+    old = Horoscope.objects.create(poster=horoscope1.poster, horoscope='Old news.')
+    Horoscope.objects.filter(id=old.id).update(date_posted=datetime.datetime(2020, 1, 5, tzinfo=datetime.timezone.utc))
+    ReportHoroscope.objects.create(reported_horoscope=horoscope1, reason='Spam')
+
+    out = io.StringIO()
+    call_command('partition_horoscopes', 'convert', stdout=out)
+    # the foreign keys into the tables cannot survive and are reported
+    assert 'Dropped foreign key' in out.getvalue()
+    call_command('partition_horoscopes', 'create', '--months=2', stdout=io.StringIO())
+
+    # the views and the daily horoscope foreign keys work as before
+    response = client.get(reverse('daily_horoscope_view'))
+    assert response.status_code == 200
+    response = client.get(reverse('singular_horoscope_view', kwargs={'hid': old.id}))
+    assert response.status_code == 200
+    created = Horoscope.objects.create(poster=horoscope1.poster, horoscope='New.')
+    assert created.id > old.id
+
+    call_command('partition_horoscopes', 'detach', '--before=2020-02-01', '--drop', stdout=io.StringIO())
+    assert not Horoscope.objects.filter(id=old.id).exists()
+    assert Horoscope.objects.filter(id=horoscope1.id).exists()
@@ -0,0 +1,62 @@
+import datetime
+import gzip
+import io
+import json
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from django.utils import timezone
+from horoscope.cache import daily_cache_key, get_daily_payload
+from horoscope.models import SIGNS, DailyHoroscope, DailyHoroscopeEntry
+
+def test_publish_daily_horoscope(client, settings, dailyhoroscope, horoscope1, horoscope2, horoscope3,
+                                 django_assert_num_queries):
+    # the test cache stands in for a shared one
+    settings.SHARED_CACHE = True
+    tomorrow = timezone.now().date() + datetime.timedelta(days=1)
+    ids = [horoscope1.id, horoscope2.id, horoscope3.id] * 4
+    call_command('publish_daily_horoscope', f'--horoscopes={",".join(str(hid) for hid in ids)}')
+
+    daily = DailyHoroscope.objects.get(date=tomorrow)
+    assert [getattr(daily, f'{sign}_id') for sign in SIGNS] == ids
+
+    # not shown before its day
+    response = client.get(reverse('daily_horoscope_view'))
+    assert json.loads(response.content.decode('utf-8')) == dailyhoroscope.serialize()
+    response = client.get(reverse('daily_horoscope_view') + f'?date={tomorrow.isoformat()}')
+    assert response.status_code == 404
+
+    # already warmed for when it comes, whole day, per sign and compressed
+    with django_assert_num_queries(0):
+        payload = get_daily_payload(tomorrow)
+        sign_payload = get_daily_payload(tomorrow, 'leo')
+    assert json.loads(payload['body']) == daily.serialize()
+    assert json.loads(gzip.decompress(payload['gzip'])) == daily.serialize()
+    entries = DailyHoroscopeEntry.objects.day(tomorrow, 'leo')
+    assert json.loads(sign_payload['body']) == DailyHoroscopeEntry.serialize_day(tomorrow, entries)
+
+def test_publish_daily_horoscope_local_cache(settings, dailyhoroscope, horoscope1, horoscope2, horoscope3):
+    settings.SHARED_CACHE = False
+    tomorrow = timezone.now().date() + datetime.timedelta(days=1)
+    ids = [horoscope1.id, horoscope2.id, horoscope3.id] * 4
+    err = io.StringIO()
+    call_command('publish_daily_horoscope', f'--horoscopes={",".join(str(hid) for hid in ids)}', stderr=err)
+
+    # created, but a cache only this process can read is not warmed
+    assert DailyHoroscope.objects.filter(date=tomorrow).exists()
+    assert 'shared CACHE_URL' in err.getvalue()
+    assert cache.get(daily_cache_key(tomorrow)) is None
+
+def test_publish_daily_horoscope_existing(dailyhoroscope):
+    call_command('publish_daily_horoscope', f'--date={dailyhoroscope.date.isoformat()}')
+    assert DailyHoroscope.objects.count() == 1
+
+def test_publish_daily_horoscope_not_enough_horoscopes(dailyhoroscope):
+    with pytest.raises(CommandError):
+        call_command('publish_daily_horoscope')
+
+def test_publish_daily_horoscope_invalid_horoscopes(horoscope1):
+    with pytest.raises(CommandError):
+        call_command('publish_daily_horoscope', f'--horoscopes={horoscope1.id}')
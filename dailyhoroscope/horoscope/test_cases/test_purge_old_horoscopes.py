@@ -0,0 +1,68 @@
+import datetime
+import io
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+from authenticate.models import get_sentinel_user
+from horoscope.models import Horoscope, ReportHoroscope, get_default_horoscope_id
+from horoscope.retention import purge_reports
+
+def age(queryset, field, days):
+    queryset.update(**{field: timezone.now() - datetime.timedelta(days=days)})
+
+def test_purge_reports(horoscope1, horoscope2):
+    old_reviewed = [ReportHoroscope.objects.create(reported_horoscope=horoscope1, reviewed=True) for _ in range(5)]
+    old_unreviewed = ReportHoroscope.objects.create(reported_horoscope=horoscope1, reviewed=False)
+    recent = ReportHoroscope.objects.create(reported_horoscope=horoscope2, reviewed=True)
+    age(ReportHoroscope.objects.exclude(id=recent.id), 'date_reported', 100)
+
+    progress = []
+    deleted = purge_reports(90, batch_size=2, sleep=0, progress=lambda n, elapsed: progress.append(n))
+
+    assert deleted == 5
+    assert progress == [2, 4, 5]
+    assert set(ReportHoroscope.objects.values_list('id', flat=True)) == {old_unreviewed.id, recent.id}
+    assert not any(ReportHoroscope.objects.filter(id=report.id).exists() for report in old_reviewed)
+
+def test_purge_horoscopes(dailyhoroscope, horoscope1, user1):
+    sentinel = get_sentinel_user()
+    # used by the daily horoscope, so kept even though it now belongs to a deleted account
+    Horoscope.objects.filter(id=horoscope1.id).update(poster=sentinel)
+    orphans = Horoscope.objects.bulk_create([
+        Horoscope(poster=sentinel, horoscope=f'Orphan {i}.') for i in range(5)
+    ])
+    ReportHoroscope.objects.create(reported_horoscope=orphans[0], reviewed=False)
+    recent_orphan = Horoscope.objects.create(poster=sentinel, horoscope='Recent orphan.')
+    mine = Horoscope.objects.create(poster=user1, horoscope='Still mine.')
+    age(Horoscope.objects.exclude(id=recent_orphan.id), 'date_posted', 400)
+
+    out = io.StringIO()
+    call_command('purge_old_horoscopes', '--horoscope-days=365', '--batch-size=2', '--sleep=0', stdout=out)
+
+    assert 'Deleted 5 horoscope(s).' in out.getvalue()
+    assert 'rows/sec' in out.getvalue()
+    assert Horoscope.objects.filter(id=horoscope1.id).exists()
+    assert Horoscope.objects.filter(id=recent_orphan.id).exists()
+    assert Horoscope.objects.filter(id=mine.id).exists()
+    assert not Horoscope.objects.filter(id__in=[orphan.id for orphan in orphans]).exists()
+    assert not ReportHoroscope.objects.filter(reported_horoscope_id=orphans[0].id).exists()
+
+def test_purge_horoscopes_keeps_placeholder(horoscope1):
+    placeholder_id = get_default_horoscope_id()
+    age(Horoscope.objects.all(), 'date_posted', 400)
+
+    call_command('purge_old_horoscopes', '--horoscope-days=365', '--sleep=0', stdout=io.StringIO())
+    assert Horoscope.objects.filter(id=placeholder_id).exists()
+
+def test_purge_horoscopes_all_posters(dailyhoroscope, horoscope1, horoscope2, horoscope3, user1):
+    mine = Horoscope.objects.create(poster=user1, horoscope='Old and unused.')
+    age(Horoscope.objects.all(), 'date_posted', 400)
+
+    call_command('purge_old_horoscopes', '--horoscope-days=365', '--all-posters', '--sleep=0', stdout=io.StringIO())
+    assert not Horoscope.objects.filter(id=mine.id).exists()
+    assert Horoscope.objects.count() == 3
+
+def test_purge_old_horoscopes_all_posters_needs_days(db):
+    with pytest.raises(CommandError):
+        call_command('purge_old_horoscopes', '--all-posters')
@@ -0,0 +1,42 @@
+import json
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+@pytest.fixture
+def subscribers(user1, user2):
+    for user in (user1, user2):
+        user.profile.subscribed_to_newsletter = True
+        user.profile.save()
+    yield user1, user2
+
+def test_send_newsletter(dailyhoroscope, subscribers, user1, user2):
+    call_command('send_newsletter', '--batch-size=1')
+
+    assert [message.to for message in mail.outbox] == [[user1.email], [user2.email]]
+    assert 'Aries: Life can get hard, but at least you have arms.' in mail.outbox[0].body
+
+def test_send_newsletter_unsubscribed(dailyhoroscope, subscribers, user1, user2):
+    user2.profile.subscribed_to_newsletter = False
+    user2.profile.save()
+
+    call_command('send_newsletter')
+
+    assert [message.to for message in mail.outbox] == [[user1.email]]
+
+def test_send_newsletter_resumes_from_checkpoint(dailyhoroscope, subscribers, user1, user2, tmp_path):
+    checkpoint = tmp_path / 'newsletter.json'
+    checkpoint.write_text(json.dumps({
+        'date': dailyhoroscope.date.isoformat(),
+        'last_profile_id': user1.profile.id,
+    }))
+
+    call_command('send_newsletter', f'--checkpoint={checkpoint}')
+
+    assert [message.to for message in mail.outbox] == [[user2.email]]
+    assert json.loads(checkpoint.read_text())['last_profile_id'] == user2.profile.id
+
+def test_send_newsletter_no_daily(subscribers):
+    with pytest.raises(CommandError):
+        call_command('send_newsletter')
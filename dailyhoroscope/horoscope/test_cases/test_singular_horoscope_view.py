@@ -138,4 +138,35 @@ def test_delete_incorrect_user(client, user1, horoscope3):
     results = json.loads(response.content.decode('utf-8'))
 
     assert response.status_code == 403
-    assert results['message'] == 'The current logged-in user does not have the permissions to delete another user\'s horoscopes.'
\ No newline at end of file
+    assert results['message'] == 'The current logged-in user does not have the permissions to delete another user\'s horoscopes.'
+
+def test_get_conditional_headers(client, horoscope1):
+    response = client.get(
+        reverse('singular_horoscope_view', kwargs={'hid': horoscope1.id})
+    )
+
+    assert response.status_code == 200
+    assert response.has_header('ETag')
+    assert response.has_header('Last-Modified')
+    assert 'max-age' in response['Cache-Control']
+
+def test_get_not_modified(client, horoscope1, django_assert_num_queries):
+    url = reverse('singular_horoscope_view', kwargs={'hid': horoscope1.id})
+    response = client.get(url)
+
+    with django_assert_num_queries(1):
+        not_modified = client.get(url, headers={'IF_NONE_MATCH': response['ETag']})
+    assert not_modified.status_code == 304
+
+    not_modified = client.get(url, headers={'IF_MODIFIED_SINCE': response['Last-Modified']})
+    assert not_modified.status_code == 304
+
+def test_get_modified_after_edit(client, horoscope1):
+    url = reverse('singular_horoscope_view', kwargs={'hid': horoscope1.id})
+    response = client.get(url)
+
+    horoscope1.horoscope = 'Life can get hard, but at least you have legs.'
+    horoscope1.save()
+
+    response = client.get(url, headers={'IF_NONE_MATCH': response['ETag']})
+    assert response.status_code == 200
@@ -1,6 +1,7 @@
 import json
 import pytest
 from django.urls import reverse
+from horoscope.models import Horoscope
 
 def test_get(client, user1, horoscope1, horoscope2, horoscope3):
     response = client.get(
@@ -9,9 +10,50 @@ def test_get(client, user1, horoscope1, horoscope2, horoscope3):
     results = json.loads(response.content.decode('utf-8'))
 
     assert response.status_code == 200
-    assert len(results) == 2
-    assert results[0] == horoscope2.serialize()
-    assert results[1] == horoscope1.serialize()
+    assert len(results['results']) == 2
+    assert results['results'][0] == horoscope2.serialize()
+    assert results['results'][1] == horoscope1.serialize()
+    assert results['next'] is None
+
+def test_get_paginated(client, user1, horoscope1, horoscope2, horoscope3):
+    url = reverse('user_horoscope_view', kwargs={'username': user1.username})
+    response = client.get(url + '?page_size=1')
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert results['results'] == [horoscope2.serialize()]
+    assert results['next'] is not None
+
+    response = client.get(url + f'?page_size=1&cursor={results["next"]}')
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 200
+    assert results['results'] == [horoscope1.serialize()]
+    assert results['next'] is None
+
+def test_get_paginated_same_timestamp(client, user1, horoscope1, horoscope2):
+    # ties on date_updated are broken by id, so no row is skipped or repeated
+    Horoscope.objects.filter(poster=user1).update(date_updated=horoscope1.date_updated)
+    url = reverse('user_horoscope_view', kwargs={'username': user1.username})
+
+    seen = []
+    params = '?page_size=1'
+    while params is not None:
+        response = client.get(url + params)
+        results = json.loads(response.content.decode('utf-8'))
+        seen.extend(result['id'] for result in results['results'])
+        params = f'?page_size=1&cursor={results["next"]}' if results['next'] else None
+
+    assert seen == [horoscope2.id, horoscope1.id]
+
+def test_get_invalid_cursor(client, user1, horoscope1):
+    response = client.get(
+        reverse('user_horoscope_view', kwargs={'username': user1.username}) + '?cursor=notacursor'
+    )
+    results = json.loads(response.content.decode('utf-8'))
+
+    assert response.status_code == 400
+    assert results['message'] == 'The given cursor is invalid.'
 
 @pytest.mark.django_db
 def test_get_user_not_exists(client):
@@ -19,4 +61,33 @@ def test_get_user_not_exists(client):
         reverse('user_horoscope_view', kwargs={'username': 'BobMarley'})
     )
 
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+def test_get_not_modified(client, user1, horoscope1, horoscope2, django_assert_num_queries):
+    url = reverse('user_horoscope_view', kwargs={'username': user1.username})
+    response = client.get(url)
+    assert 'max-age' in response['Cache-Control']
+
+    # user lookup and the page's keys only, the page itself is never read
+    with django_assert_num_queries(2):
+        response = client.get(url, headers={'IF_NONE_MATCH': response['ETag']})
+    assert response.status_code == 304
+
+def test_get_modified_after_delete(client, user1, horoscope1, horoscope2):
+    url = reverse('user_horoscope_view', kwargs={'username': user1.username})
+    response = client.get(url)
+
+    horoscope1.delete()
+
+    response = client.get(url, headers={'IF_NONE_MATCH': response['ETag']})
+    assert response.status_code == 200
+
+def test_get_modified_after_edit(client, user1, horoscope1, horoscope2):
+    url = reverse('user_horoscope_view', kwargs={'username': user1.username})
+    response = client.get(url)
+
+    horoscope1.horoscope = 'Edited.'
+    horoscope1.save()
+
+    response = client.get(url, headers={'IF_NONE_MATCH': response['ETag']})
+    assert response.status_code == 200
@@ -1,21 +1,69 @@
+import base64
 import datetime
+import itertools
+import re
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 from django.utils.html import escape
 from rest_framework import permissions, status 
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from authenticate.models import CustomUser
-from .models import Horoscope, DailyHoroscope, ReportHoroscope
+from .cache import get_daily_payload
+from .conditional import conditional_response, make_etag
+from .export import EXPORT_CONTENT_TYPES, EXPORT_FILTERS, EXPORT_FORMATS, iter_export
+from .models import SIGNS, Horoscope, DailyHoroscopeEntry, ReportHoroscope
+
+def encode_cursor(horoscope):
+    raw = f'{horoscope.date_updated.isoformat()}|{horoscope.id}'
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    # raises ValueError on anything that is not a cursor we handed out
+    raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+    date_updated, hid = raw.split('|')
+    return datetime.datetime.fromisoformat(date_updated), int(hid)
+
+def accepts_gzip(request):
+    return re.search(r'\bgzip\b', request.META.get('HTTP_ACCEPT_ENCODING', '')) is not None
 
 # Create your views here.
 
-# POST: create horoscope
+# GET: read a batch of horoscopes by id
+# POST: create horoscope(s)
 class HoroscopeView(APIView):
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+
+    def get(self, request):
+        try:
+            ids = [int(hid) for hid in request.query_params.get('ids', '').split(',')]
+        except ValueError:
+            return Response(
+                data={'message': '"ids" must be a comma-separated list of horoscope ids.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(ids) > settings.HOROSCOPE_BATCH_GET_MAX:
+            return Response(
+                data={'message': f'At most {settings.HOROSCOPE_BATCH_GET_MAX} horoscopes can be requested at once.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # one query for every id, in request order with null for the ones that do not exist
+        found = Horoscope.objects.select_related('poster').in_bulk(ids)
+        return Response(data=[
+            found[hid].serialize() if hid in found else None for hid in ids
+        ])
 
     def post(self, request):
         user = request.user
-        
+
+        if "horoscopes" in request.data:
+            return self.post_many(request)
         if "horoscope" not in request.data:
             return Response(
                 data={'message': 'Request did not contain a "horoscope" field.'},
@@ -31,6 +79,39 @@ class HoroscopeView(APIView):
             }, status=status.HTTP_201_CREATED,
         )
 
+    def post_many(self, request):
+        # a JSON list of horoscope strings, inserted together so either all or none are saved
+        texts = request.data["horoscopes"]
+        if not isinstance(texts, list) or not texts:
+            return Response(
+                data={'message': '"horoscopes" must be a non-empty list of strings.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(texts) > settings.HOROSCOPE_BULK_CREATE_MAX:
+            return Response(
+                data={'message': f'At most {settings.HOROSCOPE_BULK_CREATE_MAX} horoscopes can be uploaded at once.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        invalid = [i for i, txt in enumerate(texts) if not isinstance(txt, str) or not txt.strip()]
+        if invalid:
+            return Response(
+                data={
+                    'message': '"horoscopes" must be a non-empty list of strings.',
+                    'invalid': invalid,
+                }, status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with transaction.atomic():
+            horoscopes = Horoscope.objects.bulk_create([
+                Horoscope(poster=request.user, horoscope=escape(txt)) for txt in texts
+            ])
+        return Response(
+            data={
+                'message': f'{len(horoscopes)} horoscopes have been successfully uploaded.',
+                'data': [horoscope.id for horoscope in horoscopes],
+            }, status=status.HTTP_201_CREATED,
+        )
+
 
 # GET: read a singular horoscope
 # PUT/PATCH: update horoscope
@@ -42,8 +123,22 @@ class SingularHoroscopeView(APIView):
         return get_object_or_404(Horoscope, id=hid)
 
     def get(self, request, hid):
-        horoscope = self.get_or_404(hid)
-        return Response(data=horoscope.serialize())
+        # validators come from a primary key lookup, the horoscope is only serialized if it is sent
+        version = Horoscope.objects.filter(id=hid).values_list('date_updated', 'poster__username').first()
+        if version is None:
+            raise Http404
+        date_updated, username = version
+
+        def build_response():
+            horoscope = get_object_or_404(Horoscope.objects.select_related('poster'), id=hid)
+            return Response(data=horoscope.serialize())
+
+        return conditional_response(
+            request, build_response,
+            etag=make_etag(hid, date_updated.isoformat(), username),
+            last_modified=date_updated,
+            cache_control='horoscope',
+        )
 
     def put(self, request, hid):
         horoscope = self.get_or_404(hid)
@@ -98,27 +193,104 @@ class SingularHoroscopeView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-# GET: daily horoscopes (of a given day)
+# GET: daily horoscopes (of a given day), optionally only for one sign
 class DailyHoroscopeView(APIView):
-    def get_most_recent(self):
-        return DailyHoroscope.objects.latest('date')
-    
-    def get(self, request):
+    def get(self, request, sign=None):
+        if sign is not None and sign not in SIGNS:
+            return Response(
+                data={'message': f'"{sign}" is not a valid sign.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
         # NOTE: if date is None, use current date
         date = request.GET.get('date', None)
-        if date is None:
-            return Response(self.get_most_recent().serialize())
+        daily_date = None
+        if date is not None:
+            try:
+                daily_date = datetime.date.fromisoformat(date)
+            except:
+                return Response(
+                    data={'message': 'URL must contain a valid Date in format "YYYY-MM-DD".'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        # days published ahead of time stay hidden until they come
+        today = timezone.now().date()
+        if daily_date is not None and daily_date > today:
+            raise Http404
+
+        # payload is served as already-rendered (and already-compressed) JSON straight from the cache
         try:
-            daily_date = datetime.date.fromisoformat(date)
-        except:
+            payload = get_daily_payload(daily_date, sign)
+        except DailyHoroscopeEntry.DoesNotExist:
+            raise Http404
+        compressed = accepts_gzip(request)
+
+        def build_response():
+            if not compressed:
+                return HttpResponse(payload['body'], content_type='application/json')
+            response = HttpResponse(payload['gzip'], content_type='application/json')
+            response['Content-Encoding'] = 'gzip'
+            return response
+
+        etag = payload['etag']
+        if compressed:
+            # each representation needs its own strong ETag
+            etag = f'{etag[:-1]}-gzip"'
+        past = daily_date is not None and daily_date < today
+        response = conditional_response(
+            request, build_response,
+            etag=etag,
+            last_modified=payload['last_modified'],
+            cache_control='daily_past' if past else 'daily',
+        )
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
+
+
+# GET: daily horoscopes of every day in a date range (inclusive), optionally only for one sign
+class DailyHoroscopeRangeView(APIView):
+    def parse_date(self, request, key):
+        # raises ValueError on missing or malformed dates
+        return datetime.date.fromisoformat(request.GET.get(key, ''))
+
+    def get(self, request):
+        try:
+            start = self.parse_date(request, 'start')
+            end = self.parse_date(request, 'end')
+        except ValueError:
             return Response(
-                data={'message': 'URL must contain a valid Date in format "YYYY-MM-DD".'},
+                data={'message': 'URL must contain a valid "start" and "end" Date in format "YYYY-MM-DD".'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        horoscopes = get_object_or_404(DailyHoroscope, date=daily_date)
-        return Response(
-            data=horoscopes.serialize()
+        if end < start:
+            return Response(
+                data={'message': 'The "end" Date must not be before the "start" Date.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        max_days = settings.DAILY_HOROSCOPE_MAX_RANGE_DAYS
+        if (end - start).days + 1 > max_days:
+            return Response(
+                data={'message': f'The date range must not span more than {max_days} days.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        sign = request.GET.get('sign', None)
+        if sign is not None and sign not in SIGNS:
+            return Response(
+                data={'message': f'"{sign}" is not a valid sign.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        entries = DailyHoroscopeEntry.objects.date_range(start, end, sign)
+        days = [
+            DailyHoroscopeEntry.serialize_day(date, day)
+            for date, day in itertools.groupby(entries, key=lambda entry: entry.date)
+        ]
+        payload = JSONRenderer().render(days)
+        return conditional_response(
+            request, lambda: HttpResponse(payload, content_type='application/json'),
+            etag=make_etag(payload.decode('utf-8')),
+            cache_control='daily',
         )
 
 
@@ -127,6 +299,13 @@ class UserHoroscopeView(APIView):
     def get_or_404(self, username):
         return get_object_or_404(CustomUser, username=username)
 
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.GET.get('page_size', settings.HOROSCOPE_PAGE_SIZE))
+        except ValueError:
+            page_size = settings.HOROSCOPE_PAGE_SIZE
+        return max(1, min(page_size, settings.HOROSCOPE_MAX_PAGE_SIZE))
+
     def get(self, request, username):
         user = self.get_or_404(username)
         if user is None:
@@ -134,12 +313,37 @@ class UserHoroscopeView(APIView):
                 data={'message': f'The user "{username}" could not be found.'},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        
-        horoscopes = user.horoscopes_written.order_by('-date_updated')
-        context = []
-        for horoscope in horoscopes:
-            context.append(horoscope.serialize())
-        return Response(context)
+
+        # keyset pagination: each page continues strictly after the (date_updated, id) of the last one
+        cursor = request.GET.get('cursor', None)
+        after = None
+        if cursor is not None:
+            try:
+                after = decode_cursor(cursor)
+            except (ValueError, UnicodeDecodeError):
+                return Response(
+                    data={'message': 'The given cursor is invalid.'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        horoscopes = user.horoscopes_written.newest_first(after)
+        page_size = self.get_page_size(request)
+
+        def build_response():
+            page = list(horoscopes[:page_size + 1])
+            context = {
+                'results': [horoscope.serialize() for horoscope in page[:page_size]],
+                'next': encode_cursor(page[page_size - 1]) if len(page) > page_size else None,
+            }
+            return Response(context)
+
+        # the page's own (date_updated, id) keys, read from the index alone: an edit moves a key,
+        # a deletion shifts the next one in. No Last-Modified, a deletion does not move it
+        keys = list(horoscopes.values_list('date_updated', 'id')[:page_size + 1])
+        return conditional_response(
+            request, build_response,
+            etag=make_etag(user.id, user.username, keys, page_size, cursor),
+            cache_control='user',
+        )
 
 # POST: report a horoscope for inappropriate content
 class ReportHoroscopeView(APIView):
@@ -161,3 +365,31 @@ class ReportHoroscopeView(APIView):
             data={'message': 'Report has been submitted. Thank you for your time and consideration.'},
             status=status.HTTP_202_ACCEPTED,
         )
+
+# GET: stream every horoscope as NDJSON or CSV, for admins only
+class HoroscopeExportView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        # "format" is taken by DRF's content negotiation, so the output is picked with "output"
+        output = request.GET.get('output', 'ndjson')
+        if output not in EXPORT_FORMATS:
+            return Response(
+                data={'message': f'"output" must be one of {", ".join(EXPORT_FORMATS)}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        filters = {}
+        for name in EXPORT_FILTERS:
+            if name not in request.GET:
+                continue
+            try:
+                filters[name] = datetime.date.fromisoformat(request.GET[name])
+            except ValueError:
+                return Response(
+                    data={'message': f'"{name}" must be a valid Date in format "YYYY-MM-DD".'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        response = StreamingHttpResponse(iter_export(output, **filters), content_type=EXPORT_CONTENT_TYPES[output])
+        response['Content-Disposition'] = f'attachment; filename="horoscopes.{output}"'
+        return response